@@ -5,21 +5,39 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from routes import register_blueprints
 from flask_jwt_extended import JWTManager
+from utils.cache import cache, is_token_revoked
+from utils.db_debug import enable_raiseload, enable_query_counter
+from utils.json_provider import OrjsonProvider
 import os
 
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///crowd.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
 app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'supersecret')
+app.config['CACHE_TYPE'] = 'RedisCache' if os.getenv('REDIS_URL') else 'SimpleCache'
+app.config['CACHE_REDIS_URL'] = os.getenv('REDIS_URL')
+app.config['CACHE_DEFAULT_TIMEOUT'] = 60
+# Set SQLALCHEMY_RAISELOAD=1 in dev/test to turn accidental lazy loads into errors
+app.config['SQLALCHEMY_RAISELOAD'] = os.getenv('SQLALCHEMY_RAISELOAD') == '1'
+# Set SQLALCHEMY_COUNT_QUERIES=1 to report per-request statement counts in X-DB-Queries
+app.config['SQLALCHEMY_COUNT_QUERIES'] = os.getenv('SQLALCHEMY_COUNT_QUERIES') == '1'
 
 CORS(app)
 migrate = Migrate(app, db)
 db.init_app(app)
+cache.init_app(app)
+
+if app.config['SQLALCHEMY_RAISELOAD']:
+    enable_raiseload()
+if app.config['SQLALCHEMY_COUNT_QUERIES']:
+    enable_query_counter(app)
 
 jwt = JWTManager(app)
+jwt.token_in_blocklist_loader(is_token_revoked)
 
 #register routes
 register_blueprints(app)
@@ -53,7 +53,7 @@ class User(db.Model):
     created_paths = db.relationship("LearningPath",back_populates="creator",lazy="dynamic",cascade="all, delete-orphan",foreign_keys="LearningPath.creator_id")
     reviewed_by = db.Column(db.Integer, db.ForeignKey("user.id"))
     contributions = db.relationship("LearningPath", secondary=path_contributors, back_populates="contributors")
-    followed_paths = db.relationship("LearningPath", secondary=path_followers, back_populates="followers")
+    followed_paths = db.relationship("LearningPath", secondary=path_followers, back_populates="followers", lazy="dynamic")
     badges = db.relationship("UserBadge", back_populates="user", lazy="dynamic", cascade="all, delete-orphan")
     progress = db.relationship("UserProgress", back_populates="user", lazy="dynamic", cascade="all, delete-orphan")
     posts = db.relationship("CommunityPost", back_populates="author", cascade="all, delete-orphan", lazy="dynamic")
@@ -105,6 +105,7 @@ class LearningPath(db.Model):
     rejection_reason = db.Column(db.Text, nullable=True)
     is_published = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     creator = db.relationship("User", foreign_keys=[creator_id], back_populates="created_paths")
@@ -140,6 +141,7 @@ class Module(db.Model):
     description = db.Column(db.Text)
     learning_path_id = db.Column(db.Integer, db.ForeignKey("learning_path.id"))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     learning_path = db.relationship("LearningPath", back_populates="modules")
     quizzes = db.relationship("Quiz", back_populates="module", lazy="dynamic", cascade="all, delete-orphan")
@@ -159,7 +161,7 @@ class Quiz(db.Model):
     passing_score = db.Column(db.Integer, default=70)
 
     module = db.relationship("Module", back_populates="quizzes")
-    questions = db.relationship("Question", back_populates="quiz", lazy="dynamic", cascade="all, delete-orphan")
+    questions = db.relationship("Question", back_populates="quiz", lazy="selectin", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Quiz {self.title}>"
@@ -204,6 +206,11 @@ class UserProgress(db.Model):
     started_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime, nullable=True)
 
+    __table_args__ = (
+        db.Index("ix_userprogress_user_module", "user_id", "module_id", unique=True),
+        db.Index("ix_userprogress_user_complete", "user_id", "completion_percent"),
+    )
+
     user = db.relationship("User", back_populates="progress")
     module = db.relationship("Module", back_populates="progress_records")
 
@@ -221,6 +228,10 @@ class CommunityPost(db.Model):
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index("ix_communitypost_created_desc", created_at.desc()),
+    )
+
     author = db.relationship("User", back_populates="posts")
     comments = db.relationship("CommunityComment", back_populates="post", cascade="all, delete-orphan", lazy="dynamic")
 
@@ -237,6 +248,10 @@ class CommunityComment(db.Model):
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index("ix_communitycomment_post_created", "post_id", "created_at"),
+    )
+
     post = db.relationship("CommunityPost", back_populates="comments")
     author = db.relationship("User", back_populates="comments")
 
@@ -267,6 +282,10 @@ class UserBadge(db.Model):
     badge_id = db.Column(db.Integer, db.ForeignKey("badge.id"))
     awarded_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index("ix_userbadge_user_badge", "user_id", "badge_id"),
+    )
+
     user = db.relationship("User", back_populates="badges")
     badge = db.relationship("Badge", back_populates="users")
 
@@ -283,6 +302,10 @@ class Leaderboard(db.Model):
     rank = db.Column(db.Integer, nullable=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index("ix_leaderboard_points_desc", total_points.desc()),
+    )
+
     user = db.relationship("User", back_populates="leaderboard_entry")
 
     def __repr__(self):
@@ -23,3 +23,18 @@ def register_blueprints(app):
     app.register_blueprint(badges_bp, url_prefix="/badges")
     app.register_blueprint(moderation_bp, url_prefix="/moderation")
     app.register_blueprint(challenges_bp, url_prefix="/challenges")
+
+    _check_unique_routes(app)
+
+
+def _check_unique_routes(app):
+    """Fail at startup if two views are registered for the same URL and method."""
+    seen = {}
+    for rule in app.url_map.iter_rules():
+        for method in rule.methods - {"HEAD", "OPTIONS"}:
+            key = (rule.rule, method)
+            if key in seen:
+                raise RuntimeError(
+                    f"Duplicate route {method} {rule.rule}: {seen[key]} and {rule.endpoint}"
+                )
+            seen[key] = rule.endpoint
@@ -3,11 +3,27 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import (
     create_access_token, jwt_required, get_jwt_identity
 )
+from sqlalchemy import bindparam, select
 from models import db, User, RoleEnum
+from utils.cache import cache, me_cache_key, invalidate_profile, PROFILE_TIMEOUT
+from utils.etags import etag_from_body
 from datetime import timedelta
 
+# Privileged roles are trusted from the token's role claim, so their tokens
+# are short-lived; revoke_user_tokens() cuts them off sooner on deletion
+TOKEN_LIFETIMES = {
+    RoleEnum.admin: timedelta(hours=1),
+    RoleEnum.contributor: timedelta(hours=1),
+}
+DEFAULT_TOKEN_LIFETIME = timedelta(hours=8)
+
 auth_bp = Blueprint('auth', __name__)
 
+# Built once at import; /me only binds :uid per request
+ME_STMT = select(
+    User.id, User.username, User.email, User.role, User.points, User.xp, User.streak_days
+).where(User.id == bindparam("uid"))
+
 @auth_bp.route('/auth/test')
 def test_auth():
     return jsonify({"message": "auth route working!"})
@@ -34,9 +50,9 @@ def register():
         return jsonify({'error': "Password must be at least 8 characters"}), 400
 
     # Check for existing user
-    if User.query.filter_by(email=email).first():
+    if db.session.query(User.query.filter_by(email=email).exists()).scalar():
         return jsonify({'error': "Email already registered"}), 400
-    if User.query.filter_by(username=username).first():
+    if db.session.query(User.query.filter_by(username=username).exists()).scalar():
         return jsonify({'error': "Username already taken"}), 400
 
     hashed_pw = generate_password_hash(password)
@@ -75,11 +91,14 @@ def login():
 
     # Update streak
     user.update_streak()
+    invalidate_profile(user.id)
 
     # Create JWT token (identity as string to avoid errors)
+    # The role claim lets role_required authorize without a database lookup
     access_token = create_access_token(
         identity=str(user.id),
-        expires_delta=timedelta(hours=8)
+        additional_claims={"role": user.role.value},
+        expires_delta=TOKEN_LIFETIMES.get(user.role, DEFAULT_TOKEN_LIFETIME)
     )
 
     return jsonify({
@@ -99,10 +118,12 @@ def login():
 
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
+@etag_from_body
+@cache.cached(timeout=PROFILE_TIMEOUT, key_prefix=lambda: me_cache_key(get_jwt_identity()))
 def get_current_user():
     # Convert back to integer
     current_user_id = int(get_jwt_identity())
-    user = User.query.get(current_user_id)
+    user = db.session.execute(ME_STMT, {"uid": current_user_id}).one_or_none()
     if not user:
         return jsonify({"error": "User not found"}), 404
 
@@ -4,6 +4,7 @@ from sqlalchemy import func
 from models import db, Badge, User, UserBadge
 from services.core_services import BadgeService
 from utils.role_required import role_required
+from utils.cache import invalidate_profile
 from datetime import datetime
 
 badges_bp = Blueprint('badges_bp', __name__)
@@ -13,7 +14,10 @@ badges_bp = Blueprint('badges_bp', __name__)
 @badges_bp.route('/', methods=['GET'])
 def get_all_badges():
     try:
-        badges = Badge.query.all()
+        # Plain rows, no Badge instances to hydrate
+        badges = Badge.query.with_entities(
+            Badge.id, Badge.key, Badge.name, Badge.description, Badge.created_at
+        ).all()
         return jsonify([
             {
                 "id": b.id,
@@ -51,8 +55,7 @@ def get_badge(badge_key):
 @jwt_required()
 def get_my_badges():
     try:
-        current_user = get_jwt_identity()
-        user_id = current_user["id"]
+        user_id = int(get_jwt_identity())
 
         all_badges = Badge.query.all()
         earned_badge_ids = {b.badge_id for b in UserBadge.query.filter_by(user_id=user_id).all()}
@@ -102,17 +105,19 @@ def award_badge():
             return jsonify({"error": "User not found"}), 404
 
         # Check if user already has this badge
-        existing = (
+        already_awarded = db.session.query(
             db.session.query(UserBadge)
             .join(Badge)
             .filter(UserBadge.user_id == user.id, Badge.key == badge_key)
-            .first()
-        )
-        if existing:
+            .exists()
+        ).scalar()
+        if already_awarded:
             return jsonify({"error": f"User already has badge '{badge_key}'"}), 400
 
         # Award the badge using your existing service
         BadgeService.award_badge(user, badge_key)
+        db.session.commit()
+        invalidate_profile(user.id)
 
         return jsonify({
             "message": f"Badge '{badge_key}' awarded to {user.username}",
@@ -189,7 +194,7 @@ def create_badge():
             return jsonify({"error": "key, name, and description are required"}), 400
 
         # Check if badge key already exists
-        if Badge.query.filter_by(key=key).first():
+        if db.session.query(Badge.query.filter_by(key=key).exists()).scalar():
             return jsonify({"error": "Badge key already exists"}), 400
 
         new_badge = Badge(
@@ -5,6 +5,7 @@ from sqlalchemy import func, and_, or_
 from models import db, UserChallenge, ChallengeParticipation, PlatformEvent, User, PointsLog
 from services.core_services import PointsService
 from utils.role_required import role_required
+from utils.cache import invalidate_profile
 
 challenges_bp = Blueprint('challenges_bp', __name__)
 
@@ -83,8 +84,7 @@ def get_active_events():
 @jwt_required()
 def join_challenge(challenge_id):
     try:
-        current_user = get_jwt_identity()
-        user_id = current_user["id"]
+        user_id = int(get_jwt_identity())
         
         challenge = UserChallenge.query.get_or_404(challenge_id)
         
@@ -94,12 +94,14 @@ def join_challenge(challenge_id):
             return jsonify({"error": "This challenge has ended"}), 400
         
         # Check if user already joined
-        existing_participation = ChallengeParticipation.query.filter_by(
-            user_id=user_id,
-            challenge_id=challenge_id
-        ).first()
-        
-        if existing_participation:
+        already_joined = db.session.query(
+            ChallengeParticipation.query.filter_by(
+                user_id=user_id,
+                challenge_id=challenge_id
+            ).exists()
+        ).scalar()
+        
+        if already_joined:
             return jsonify({"error": "Already joined this challenge"}), 400
         
         # Create participation
@@ -132,8 +134,7 @@ def join_challenge(challenge_id):
 @jwt_required()
 def join_event(event_id):
     try:
-        current_user = get_jwt_identity()
-        user_id = current_user["id"]
+        user_id = int(get_jwt_identity())
         
         event = PlatformEvent.query.get_or_404(event_id)
         current_time = datetime.utcnow()
@@ -143,12 +144,14 @@ def join_event(event_id):
             return jsonify({"error": "This event is not currently active"}), 400
         
         # Check if user already joined
-        existing_participation = ChallengeParticipation.query.filter_by(
-            user_id=user_id,
-            event_id=event_id
-        ).first()
-        
-        if existing_participation:
+        already_joined = db.session.query(
+            ChallengeParticipation.query.filter_by(
+                user_id=user_id,
+                event_id=event_id
+            ).exists()
+        ).scalar()
+        
+        if already_joined:
             return jsonify({"error": "Already joined this event"}), 400
         
         # Create participation
@@ -179,8 +182,7 @@ def join_event(event_id):
 @jwt_required()
 def get_my_challenges():
     try:
-        current_user = get_jwt_identity()
-        user_id = current_user["id"]
+        user_id = int(get_jwt_identity())
         
         participations = ChallengeParticipation.query.filter_by(
             user_id=user_id
@@ -229,8 +231,7 @@ def get_my_challenges():
 @jwt_required()
 def update_challenge_progress(participation_id):
     try:
-        current_user = get_jwt_identity()
-        user_id = current_user["id"]
+        user_id = int(get_jwt_identity())
         
         participation = ChallengeParticipation.query.filter_by(
             id=participation_id,
@@ -258,6 +259,8 @@ def update_challenge_progress(participation_id):
             participation.progress_percent = min(100, max(0, progress_percent))
         
         db.session.commit()
+        if mark_completed:
+            invalidate_profile(user_id)
         
         return jsonify({
             "message": "Progress updated successfully",
@@ -1,5 +1,8 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from math import ceil
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
 from models import db, User, CommunityPost, CommunityComment, RoleEnum
 from utils.role_required import role_required
 
@@ -11,7 +14,7 @@ community_bp = Blueprint("community_bp", __name__)
 @role_required("admin", "contributor")  # individual args
 def create_post():
     try:
-        current_user = get_jwt_identity()
+        user_id = int(get_jwt_identity())
         data = request.get_json()
 
         title = data.get("title", "").strip()
@@ -28,7 +31,7 @@ def create_post():
         post = CommunityPost(
             title=title,
             content=content,
-            author_id=current_user["id"]
+            author_id=user_id
         )
         db.session.add(post)
         db.session.commit()
@@ -51,35 +54,66 @@ def create_post():
 # Get all posts (with pagination) 
 @community_bp.route("/posts", methods=["GET"])
 def get_posts():
-    page = request.args.get("page", 1, type=int)
-    per_page = request.args.get("per_page", 10, type=int)
-
-    pagination = CommunityPost.query.order_by(CommunityPost.created_at.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = max(request.args.get("per_page", 10, type=int), 1)
+
+    # Fetch one extra row to learn whether a next page exists, instead of
+    # running a COUNT(*) over every post. Authors for the whole page arrive
+    # in one extra SELECT ... IN
+    rows = CommunityPost.query.options(selectinload(CommunityPost.author)).order_by(
+        CommunityPost.created_at.desc()
+    ).limit(per_page + 1).offset((page - 1) * per_page).all()
+    has_next = len(rows) > per_page
+    page_posts = rows[:per_page]
+
+    # Comment counts for the page in one grouped query
+    post_ids = [post.id for post in page_posts]
+    comment_counts = dict(
+        db.session.query(CommunityComment.post_id, func.count(CommunityComment.id))
+        .filter(CommunityComment.post_id.in_(post_ids))
+        .group_by(CommunityComment.post_id)
+        .all()
+    ) if post_ids else {}
 
     posts = []
-    for post in pagination.items:
+    for post in page_posts:
         posts.append({
             "id": post.id,
             "title": post.title,
             "content": post.content,
             "author": post.author.username,
             "created_at": post.created_at.isoformat(),
-            "comments_count": post.comments.count()
+            "comments_count": comment_counts.get(post.id, 0)
         })
 
-    return jsonify({
+    response = {
         "posts": posts,
-        "total": pagination.total,
-        "pages": pagination.pages,
-        "current_page": pagination.page
-    }), 200
+        "current_page": page,
+        "per_page": per_page,
+        "has_next": has_next
+    }
+
+    # Clients that page by page count can still ask for the totals; only they pay for COUNT(*)
+    if request.args.get("with_total", type=int):
+        if has_next or (page > 1 and not page_posts):
+            total = db.session.scalar(select(func.count(CommunityPost.id)))
+        else:
+            total = (page - 1) * per_page + len(page_posts)
+        response["total"] = total
+        response["pages"] = ceil(total / per_page) if total else 0
+
+    return jsonify(response), 200
 
 # Get a single post and its comments 
 @community_bp.route("/posts/<int:post_id>", methods=["GET"])
 def get_single_post(post_id):
-    post = CommunityPost.query.get_or_404(post_id)
+    post = CommunityPost.query.options(selectinload(CommunityPost.author)).get_or_404(post_id)
+    comments = (
+        CommunityComment.query.options(selectinload(CommunityComment.author))
+        .filter_by(post_id=post.id)
+        .order_by(CommunityComment.created_at.asc())
+        .all()
+    )
 
     return jsonify({
         "id": post.id,
@@ -93,7 +127,7 @@ def get_single_post(post_id):
                 "content": c.content,
                 "author": c.author.username,
                 "created_at": c.created_at.isoformat()
-            } for c in post.comments.order_by(CommunityComment.created_at.asc()).all()
+            } for c in comments
         ]
     }), 200
 
@@ -102,7 +136,7 @@ def get_single_post(post_id):
 @jwt_required()
 def add_comment(post_id):
     try:
-        current_user = get_jwt_identity()
+        user_id = int(get_jwt_identity())
         data = request.get_json()
         content = data.get("content", "").strip()
 
@@ -116,7 +150,7 @@ def add_comment(post_id):
         comment = CommunityComment(
             content=content,
             post_id=post.id,
-            author_id=current_user["id"]
+            author_id=user_id
         )
         db.session.add(comment)
         db.session.commit()
@@ -139,10 +173,10 @@ def add_comment(post_id):
 @community_bp.route("/posts/<int:post_id>", methods=["DELETE"])
 @jwt_required()
 def delete_post(post_id):
-    current_user = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     post = CommunityPost.query.get_or_404(post_id)
 
-    if current_user["role"] != "admin" and post.author_id != current_user["id"]:
+    if get_jwt().get("role") != "admin" and post.author_id != user_id:
         return jsonify({"error": "Not authorized"}), 403
 
     db.session.delete(post)
@@ -153,10 +187,10 @@ def delete_post(post_id):
 @community_bp.route("/comments/<int:comment_id>", methods=["DELETE"])
 @jwt_required()
 def delete_comment(comment_id):
-    current_user = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     comment = CommunityComment.query.get_or_404(comment_id)
 
-    if current_user["role"] != "admin" and comment.author_id != current_user["id"]:
+    if get_jwt().get("role") != "admin" and comment.author_id != user_id:
         return jsonify({"error": "Not authorized"}), 403
 
     db.session.delete(comment)
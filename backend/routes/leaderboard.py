@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, timedelta
-from sqlalchemy import desc, func
+from sqlalchemy import case, desc, func, select
 from models import db, Leaderboard, User, PointsLog
 from services.core_services import LeaderboardService
 from utils.role_required import role_required
@@ -14,32 +14,20 @@ def get_global_leaderboard():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
     
-    leaderboard = Leaderboard.query.join(User).order_by(
-        Leaderboard.rank.asc()
-    ).paginate(page=page, per_page=per_page, error_out=False)
+    leaderboard = LeaderboardService.get_leaderboard_page(page, per_page)
     
     return jsonify({
-        "leaderboard": [
-            {
-                "rank": entry.rank,
-                "user_id": entry.user_id,
-                "username": entry.user.username,
-                "points": entry.total_points,
-                "xp": entry.user.xp,
-                "badges_count": entry.user.badges.count()
-            } for entry in leaderboard.items
-        ],
+        "leaderboard": leaderboard["items"],
         "page": page,
-        "total_pages": leaderboard.pages,
-        "total_players": leaderboard.total
+        "total_pages": leaderboard["pages"],
+        "total_players": leaderboard["total"]
     }), 200
 
 # GET Current User's Rank
 @leaderboard_bp.route('/my-rank', methods=['GET'])
 @jwt_required()
 def get_my_rank():
-    current_user = get_jwt_identity()
-    user_id = current_user["id"]
+    user_id = int(get_jwt_identity())
     
     leaderboard_entry = Leaderboard.query.filter_by(user_id=user_id).first()
     user = User.query.get(user_id)
@@ -55,10 +43,8 @@ def get_my_rank():
         }), 200
     
     # Get users above and below for context
-    rank = leaderboard_entry.rank
-    nearby_players = Leaderboard.query.join(User).filter(
-        Leaderboard.rank.between(max(1, rank - 2), rank + 2)
-    ).order_by(Leaderboard.rank.asc()).all()
+    rank = LeaderboardService.get_user_rank(user_id)
+    nearby_players = LeaderboardService.ranked_entries(max(1, rank - 2), rank + 2).all()
     
     return jsonify({
         "rank": rank,
@@ -72,10 +58,10 @@ def get_my_rank():
         },
         "nearby_players": [
             {
-                "rank": entry.rank,
+                "rank": entry_rank,
                 "username": entry.user.username,
                 "points": entry.total_points
-            } for entry in nearby_players
+            } for entry, entry_rank in nearby_players
         ]
     }), 200
 
@@ -84,21 +70,10 @@ def get_my_rank():
 def get_top_players():
     limit = request.args.get('limit', 10, type=int)
     
-    top_players = Leaderboard.query.join(User).order_by(
-        Leaderboard.rank.asc()
-    ).limit(limit).all()
+    top_players = LeaderboardService.get_top_users(limit)
     
     return jsonify({
-        "top_players": [
-            {
-                "rank": entry.rank,
-                "username": entry.user.username,
-                "points": entry.total_points,
-                "xp": entry.user.xp,
-                "badges_count": entry.user.badges.count(),
-                "streak_days": entry.user.streak_days
-            } for entry in top_players
-        ]
+        "top_players": top_players
     }), 200
 
 
@@ -159,11 +134,13 @@ def get_category_leaderboard(category):
 def force_leaderboard_update():
     try:
         LeaderboardService.update_all_ranks()
+        db.session.commit()
         return jsonify({
             "message": "Leaderboard updated successfully",
             "timestamp": datetime.utcnow().isoformat()
         }), 200
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": "Failed to update leaderboard"}), 500
 
 # ADMIN: Get Leaderboard Statistics
@@ -171,11 +148,6 @@ def force_leaderboard_update():
 @jwt_required()
 @role_required("admin")
 def get_leaderboard_stats():
-    total_players = User.query.count()
-    ranked_players = Leaderboard.query.count()
-    average_points = db.session.query(func.avg(User.points)).scalar() or 0
-    top_player = Leaderboard.query.join(User).order_by(Leaderboard.rank.asc()).first()
-    
     # Points distribution
     points_ranges = [
         (0, 100, '0-100'),
@@ -184,15 +156,28 @@ def get_leaderboard_stats():
         (1001, 5000, '1001-5000'),
         (5001, None, '5000+')
     ]
-    
-    distribution = []
+
+    bucket_counts = []
     for min_points, max_points, label in points_ranges:
-        query = User.query
-        if min_points is not None:
-            query = query.filter(User.points >= min_points)
+        condition = User.points >= min_points
         if max_points is not None:
-            query = query.filter(User.points <= max_points)
-        count = query.count()
+            condition = condition & (User.points <= max_points)
+        bucket_counts.append(func.count(case((condition, User.id))))
+
+    # Totals, average and every bucket in one pass over users
+    total_players, average_points, ranked_players, *range_counts = db.session.execute(
+        select(
+            func.count(User.id),
+            func.avg(User.points),
+            select(func.count(Leaderboard.id)).scalar_subquery(),
+            *bucket_counts
+        )
+    ).one()
+    average_points = average_points or 0
+    top_player, top_rank = LeaderboardService.ranked_entries().first() or (None, None)
+
+    distribution = []
+    for (min_points, max_points, label), count in zip(points_ranges, range_counts):
         distribution.append({
             "range": label,
             "players": count,
@@ -208,7 +193,7 @@ def get_leaderboard_stats():
             "top_player": {
                 "username": top_player.user.username if top_player else None,
                 "points": top_player.total_points if top_player else 0,
-                "rank": top_player.rank if top_player else None
+                "rank": top_rank
             } if top_player else None
         },
         "points_distribution": distribution
@@ -218,8 +203,7 @@ def get_leaderboard_stats():
 @leaderboard_bp.route('/my-points-history', methods=['GET'])
 @jwt_required()
 def get_my_points_history():
-    current_user = get_jwt_identity()
-    user_id = current_user["id"]
+    user_id = int(get_jwt_identity())
     
     days = request.args.get('days', 30, type=int)
     start_date = datetime.utcnow() - timedelta(days=days)
@@ -1,12 +1,24 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity, verify_jwt_in_request
 from datetime import datetime
-from models import db, LearningPath, ContentStatusEnum, User, UserProgress
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import joinedload
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import (
+    db, LearningPath, ContentStatusEnum, User, UserProgress, Module, LearningResource, Quiz,
+    path_followers
+)
+from utils.etags import make_etag, not_modified
 from utils.role_required import role_required
-from services.core_services import PointsService
+from utils.schemas import parse_body, CreatePathIn, ReviewPathIn, FollowPathsIn
+from services.tasks import enqueue_award_points
 
 learning_paths_bp = Blueprint('learning_paths_bp', __name__)
 
+# Response keys for the path listing, in the same order as the selected columns
+_PATH_KEYS = ("id", "title", "description", "is_published")
+
 @learning_paths_bp.route('/test')
 def test_learning():
     return jsonify({"message": "Learning route working!"})
@@ -19,72 +31,94 @@ def get_learning_paths():
     per_page = request.args.get("per_page", 10, type=int)
     status_filter = request.args.get("status")
 
-    # Optional JWT check
-    current_user = None
+    # Optional JWT check; the role claim is all this listing needs
+    is_admin = False
     try:
         verify_jwt_in_request(optional=True)
-        current_user_identity = get_jwt_identity()
-        if current_user_identity:
-            # Handle both dict and simple ID
-            user_id = current_user_identity["id"] if isinstance(current_user_identity, dict) else current_user_identity
-            current_user = User.query.get(user_id)
+        is_admin = get_jwt().get("role") == "admin"
     except:
-        current_user = None
+        is_admin = False
 
     # Base query
     query = LearningPath.query
 
     # Only admins can see unpublished paths
-    if not (current_user and current_user.role == "admin"):
+    if not is_admin:
         query = query.filter(LearningPath.is_published == True)
 
     # Admin can filter by status
-    if current_user and current_user.role == "admin":
+    if is_admin:
         if status_filter == "published":
             query = query.filter(LearningPath.is_published == True)
         elif status_filter == "pending":
             query = query.filter(LearningPath.is_published == False)
 
-    # Pagination
-    paths_paginated = query.paginate(page=page, per_page=per_page, error_out=False)
-    paths_list = [
-        {
-            "id": lp.id,
-            "title": lp.title,
-            "description": lp.description,
-            "is_published": lp.is_published
-        }
-        for lp in paths_paginated.items
-    ]
-
-    return jsonify({
+    # Fingerprint the listing cheaply so unchanged pages can answer 304
+    last_updated, total = query.with_entities(
+        func.max(LearningPath.updated_at), func.count(LearningPath.id)
+    ).one()
+    etag = make_etag(
+        "paths", is_admin,
+        status_filter, page, per_page, total, last_updated
+    )
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    # Pagination (total is already known from the fingerprint query)
+    paths_paginated = query.with_entities(
+        LearningPath.id, LearningPath.title, LearningPath.description, LearningPath.is_published
+    ).paginate(page=page, per_page=per_page, error_out=False, count=False)
+    paths_list = [dict(zip(_PATH_KEYS, row)) for row in paths_paginated.items]
+
+    response = jsonify({
         "page": page,
         "per_page": per_page,
-        "total": paths_paginated.total,
+        "total": total,
         "paths": paths_list
     })
+    response.set_etag(etag, weak=True)
+    return response
 
 
 # GET a single Learning Path with modules
 @learning_paths_bp.route('/paths/<int:path_id>', methods=['GET'])
 def get_single_learning_path(path_id):
-    path = LearningPath.query.get_or_404(path_id)
+    path = LearningPath.query.options(joinedload(LearningPath.creator)).get_or_404(path_id)
     
-    # Optional JWT check
-    current_user = None
+    # Optional JWT check; the role claim is all this view needs
+    is_admin = False
     try:
         verify_jwt_in_request(optional=True)
-        current_user_identity = get_jwt_identity()
-        if current_user_identity:
-            user_id = current_user_identity["id"] if isinstance(current_user_identity, dict) else current_user_identity
-            current_user = User.query.get(user_id)
+        is_admin = get_jwt().get("role") == "admin"
     except:
-        current_user = None
+        is_admin = False
     
-    if not path.is_published and (not current_user or current_user.role != "admin"):
+    if not path.is_published and not is_admin:
         return jsonify({"error": "Learning path not found"}), 404
 
-    return jsonify({
+    etag = make_etag("path", path.id, path.updated_at, *_modules_fingerprint(path.id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    # Modules with their resource and quiz counts in one query; `modules` is a
+    # dynamic relationship, so it cannot be eager-loaded with the path
+    modules = db.session.execute(
+        select(
+            Module.id, Module.title, Module.description,
+            select(func.count(LearningResource.id))
+            .where(LearningResource.module_id == Module.id)
+            .correlate(Module).scalar_subquery().label("resource_count"),
+            select(func.count(Quiz.id))
+            .where(Quiz.module_id == Module.id)
+            .correlate(Module).scalar_subquery().label("quiz_count")
+        )
+        .where(Module.learning_path_id == path.id)
+        .order_by(Module.id)
+    ).all()
+
+    response = jsonify({
         "id": path.id,
         "title": path.title,
         "description": path.description,
@@ -97,11 +131,24 @@ def get_single_learning_path(path_id):
                 "id": module.id,
                 "title": module.title,
                 "description": module.description,
-                "resource_count": module.resources.count(),
-                "quiz_count": module.quizzes.count()
-            } for module in path.modules
+                "resource_count": module.resource_count,
+                "quiz_count": module.quiz_count
+            } for module in modules
         ]
-    }), 200
+    })
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def _modules_fingerprint(path_id):
+    """Latest module change plus module/resource/quiz counts for a path, in one query."""
+    module_ids = select(Module.id).where(Module.learning_path_id == path_id)
+    return db.session.query(
+        select(func.max(Module.updated_at)).where(Module.learning_path_id == path_id).scalar_subquery(),
+        select(func.count(Module.id)).where(Module.learning_path_id == path_id).scalar_subquery(),
+        select(func.count(LearningResource.id)).where(LearningResource.module_id.in_(module_ids)).scalar_subquery(),
+        select(func.count(Quiz.id)).where(Quiz.module_id.in_(module_ids)).scalar_subquery()
+    ).one()
 
 # Create a new learning path
 @learning_paths_bp.route('/paths', methods=['POST'])
@@ -109,26 +156,19 @@ def get_single_learning_path(path_id):
 @role_required("admin", "contributor")
 def create_learning_path():
     try:
-        current_user_identity = get_jwt_identity()
-        # Handle both dict and simple ID
-        user_id = current_user_identity["id"] if isinstance(current_user_identity, dict) else current_user_identity
+        user_id = int(get_jwt_identity())
         user = User.query.get(user_id)
         
         if not user:
             return jsonify({"error": "User not found"}), 404
         
-        data = request.get_json()
-        title = data.get("title", "").strip()
-        description = data.get("description", "").strip()
-
-        if not title:
-            return jsonify({"error": "Title is required"}), 400
-        if len(title) < 5:
-            return jsonify({"error": "Title must be at least 5 characters"}), 400
+        data, error = parse_body(CreatePathIn)
+        if error:
+            return error
 
         new_path = LearningPath(
-            title=title,
-            description=description,
+            title=data.title,
+            description=data.description,
             creator=user,
             status=ContentStatusEnum.pending,
             is_published=False
@@ -136,7 +176,7 @@ def create_learning_path():
 
         db.session.add(new_path)
         db.session.commit()
-        PointsService.award_points(user, 'create_learning_path')
+        enqueue_award_points(user.id, 'create_learning_path')
 
         return jsonify({
             "message": "Learning path created successfully and submitted for review",
@@ -152,13 +192,20 @@ def create_learning_path():
         return jsonify({"error": "Failed to create learning path"}), 500
 
 
+def _insert_follows():
+    """INSERT into path_followers that skips rows which already exist."""
+    dialect_insert = pg_insert if db.session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    return dialect_insert(path_followers).on_conflict_do_nothing(
+        index_elements=[path_followers.c.path_id, path_followers.c.user_id]
+    )
+
+
 # Follow Learning Path
 @learning_paths_bp.route('/paths/<int:path_id>/follow', methods=['POST'])
 @jwt_required()
 def follow_path(path_id):
     try:
-        current_user_identity = get_jwt_identity()
-        user_id = current_user_identity["id"] if isinstance(current_user_identity, dict) else current_user_identity
+        user_id = int(get_jwt_identity())
         
         path = LearningPath.query.get_or_404(path_id)
         user = User.query.get(user_id)
@@ -168,10 +215,18 @@ def follow_path(path_id):
 
         if not path.is_published:
             return jsonify({"error": "Cannot follow an unpublished learning path"}), 400
-        if path in user.followed_paths:
-            return jsonify({"error": "Already following this path"}), 400
 
-        user.followed_paths.append(path)
+        # Insert straight into the association table so the user's whole
+        # followed_paths collection is never loaded. An existing follow is
+        # skipped by the database, and RETURNING reports whether a row was added
+        followed = db.session.execute(
+            _insert_follows()
+            .values(user_id=user.id, path_id=path.id)
+            .returning(path_followers.c.path_id)
+        ).first()
+        if not followed:
+            db.session.rollback()
+            return jsonify({"error": "Already following this path"}), 400
         db.session.commit()
         return jsonify({
             "message": "Now following learning path",
@@ -182,28 +237,84 @@ def follow_path(path_id):
         return jsonify({"error": "Failed to follow learning path"}), 500
 
 
-# Unfollow Learning Path
-@learning_paths_bp.route('/paths/<int:path_id>/unfollow', methods=['POST'])
+# Follow several Learning Paths at once
+@learning_paths_bp.route('/paths/follow/batch', methods=['POST'])
 @jwt_required()
-def unfollow_path(path_id):
+def follow_paths_batch():
+    data, error = parse_body(FollowPathsIn)
+    if error:
+        return error
+
     try:
-        current_user_identity = get_jwt_identity()
-        user_id = current_user_identity["id"] if isinstance(current_user_identity, dict) else current_user_identity
-        
-        path = LearningPath.query.get_or_404(path_id)
+        user_id = int(get_jwt_identity())
+
         user = User.query.get(user_id)
-        
         if not user:
             return jsonify({"error": "User not found"}), 404
 
-        if path not in user.followed_paths:
+        # One query finds which requested paths are published and not yet followed
+        already_following = exists().where(
+            path_followers.c.user_id == user.id,
+            path_followers.c.path_id == LearningPath.id
+        )
+        paths = db.session.execute(
+            select(LearningPath.id, LearningPath.title)
+            .where(
+                LearningPath.id.in_(set(data.path_ids)),
+                LearningPath.is_published.is_(True),
+                ~already_following
+            )
+            .order_by(LearningPath.id)
+        ).all()
+
+        if paths:
+            db.session.execute(
+                _insert_follows(),
+                [{"user_id": user.id, "path_id": p.id} for p in paths]
+            )
+            db.session.commit()
+
+        followed_ids = {p.id for p in paths}
+        return jsonify({
+            "message": f"Now following {len(paths)} learning path(s)",
+            "paths": [{"id": p.id, "title": p.title} for p in paths],
+            "skipped": sorted(set(data.path_ids) - followed_ids)
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": "Failed to follow learning paths"}), 500
+
+
+# Unfollow Learning Path
+@learning_paths_bp.route('/paths/<int:path_id>/unfollow', methods=['POST'])
+@jwt_required()
+def unfollow_path(path_id):
+    try:
+        user_id = int(get_jwt_identity())
+        
+        # Delete the follow row directly; RETURNING tells us whether one existed,
+        # so neither the user nor a separate follow check is needed
+        deleted = db.session.execute(
+            delete(path_followers)
+            .where(
+                path_followers.c.user_id == user_id,
+                path_followers.c.path_id == path_id
+            )
+            .returning(path_followers.c.path_id)
+        ).first()
+        title = db.session.scalar(select(LearningPath.title).where(LearningPath.id == path_id))
+
+        if title is None:
+            db.session.rollback()
+            return jsonify({"error": "Learning path not found"}), 404
+        if not deleted:
+            db.session.rollback()
             return jsonify({"error": "Not following this path"}), 400
 
-        user.followed_paths.remove(path)
         db.session.commit()
         return jsonify({
             "message": "Unfollowed learning path",
-            "path": {"id": path.id, "title": path.title}
+            "path": {"id": path_id, "title": title}
         }), 200
     except Exception as e:
         db.session.rollback()
@@ -214,39 +325,69 @@ def unfollow_path(path_id):
 @learning_paths_bp.route("/my-paths", methods=["GET"])
 @jwt_required()
 def get_my_learning_paths():
+    page = request.args.get("page", 1, type=int)
+    per_page = request.args.get("per_page", 10, type=int)
     try:
         # Get current user identity from JWT
-        current_user_identity = get_jwt_identity()
-        # Handle both dict and simple ID formats
-        user_id = current_user_identity["id"] if isinstance(current_user_identity, dict) else current_user_identity
+        user_id = int(get_jwt_identity())
         
         user = User.query.get(user_id)
         
         if not user:
             return jsonify({"error": "User not found"}), 404
 
-        followed_paths = []
-
-        for path in user.followed_paths:
-            # Only include published paths
-            if path.is_published:
-                # Count completed modules
-                completed_modules = sum(
-                    1 for module in path.modules if module in user.completed_modules
-                )
-                total_modules = len(path.modules)
-                completion_percentage = (
-                    int((completed_modules / total_modules) * 100) if total_modules > 0 else 0
-                )
-
-                followed_paths.append({
-                    "id": path.id,
-                    "title": path.title,
-                    "description": path.description,
-                    "completion_percentage": completion_percentage
-                })
-
-        return jsonify(followed_paths), 200
+        followed_ids = select(path_followers.c.path_id).where(path_followers.c.user_id == user.id)
+
+        # Per-path module totals and this user's completed modules, for followed paths only
+        module_counts = (
+            select(
+                Module.learning_path_id,
+                func.count(Module.id).label("total"),
+                func.count(UserProgress.id).label("completed")
+            )
+            .outerjoin(
+                UserProgress,
+                (UserProgress.module_id == Module.id)
+                & (UserProgress.user_id == user.id)
+                & (UserProgress.completion_percent == 100)
+            )
+            .where(Module.learning_path_id.in_(followed_ids))
+            .group_by(Module.learning_path_id)
+            .subquery()
+        )
+
+        # One page of followed, published paths with their counts
+        paths_paginated = (
+            db.session.query(
+                LearningPath.id,
+                LearningPath.title,
+                LearningPath.description,
+                func.coalesce(module_counts.c.total, 0).label("total"),
+                func.coalesce(module_counts.c.completed, 0).label("completed")
+            )
+            .join(path_followers, path_followers.c.path_id == LearningPath.id)
+            .outerjoin(module_counts, module_counts.c.learning_path_id == LearningPath.id)
+            .filter(path_followers.c.user_id == user.id, LearningPath.is_published.is_(True))
+            .order_by(LearningPath.id)
+            .paginate(page=page, per_page=per_page, max_per_page=100, error_out=False)
+        )
+
+        followed_paths = [
+            {
+                "id": row.id,
+                "title": row.title,
+                "description": row.description,
+                "completion_percentage": int((row.completed / row.total) * 100) if row.total > 0 else 0
+            } for row in paths_paginated.items
+        ]
+
+        return jsonify({
+            "paths": followed_paths,
+            "page": paths_paginated.page,
+            "per_page": paths_paginated.per_page,
+            "total": paths_paginated.total,
+            "pages": paths_paginated.pages
+        }), 200
     
     except Exception as e:
         return jsonify({"error": "Failed to retrieve followed paths", "details": str(e)}), 500
@@ -258,29 +399,28 @@ def get_my_learning_paths():
 @role_required("admin")
 def review_learning_path(path_id):
     try:
-        current_user_identity = get_jwt_identity()
-        user_id = current_user_identity["id"] if isinstance(current_user_identity, dict) else current_user_identity
+        user_id = int(get_jwt_identity())
         
         path = LearningPath.query.get_or_404(path_id)
-        data = request.get_json()
-        action = data.get("action")
-        reason = data.get("reason", "")
+        data, error = parse_body(ReviewPathIn)
+        if error:
+            return error
+        action = data.action
 
         if action == "approve":
             path.status = ContentStatusEnum.approved
             path.is_published = True
             path.reviewed_by = user_id
             path.rejection_reason = None
-            PointsService.award_points(path.creator, 'learning_path_approved')
         elif action == "reject":
             path.status = ContentStatusEnum.rejected
             path.is_published = False
-            path.rejection_reason = reason
+            path.rejection_reason = data.reason
             path.reviewed_by = user_id
-        else:
-            return jsonify({"error": "Invalid action"}), 400
 
         db.session.commit()
+        if action == "approve" and path.creator_id:
+            enqueue_award_points(path.creator_id, 'learning_path_approved')
         return jsonify({
             "message": f"Learning path {action}d",
             "path": {
@@ -302,17 +442,35 @@ def review_learning_path(path_id):
 def get_pending_paths():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
-    pending_paths = LearningPath.query.filter_by(status=ContentStatusEnum.pending).paginate(page=page, per_page=per_page, error_out=False)
+    # Only the rendered columns; creator name and module count come from the
+    # same SELECT instead of a lazy load and a COUNT per path
+    module_count = (
+        select(func.count(Module.id))
+        .where(Module.learning_path_id == LearningPath.id)
+        .correlate(LearningPath)
+        .scalar_subquery()
+    )
+    pending_paths = (
+        LearningPath.query
+        .outerjoin(User, User.id == LearningPath.creator_id)
+        .filter(LearningPath.status == ContentStatusEnum.pending)
+        .with_entities(
+            LearningPath.id, LearningPath.title, LearningPath.description,
+            User.username, module_count, LearningPath.created_at
+        )
+        .order_by(LearningPath.id)
+        .paginate(page=page, per_page=per_page, error_out=False)
+    )
 
     data = [
         {
-            "id": path.id,
-            "title": path.title,
-            "description": path.description,
-            "creator": path.creator.username if path.creator else "Unknown",
-            "module_count": path.modules.count(),
-            "created_at": path.created_at.isoformat()
-        } for path in pending_paths.items
+            "id": path_id,
+            "title": title,
+            "description": description,
+            "creator": creator or "Unknown",
+            "module_count": modules,
+            "created_at": created_at.isoformat()
+        } for path_id, title, description, creator, modules, created_at in pending_paths.items
     ]
 
     return jsonify({
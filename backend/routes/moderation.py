@@ -1,30 +1,36 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import aliased
 from models import db, ContentFlag, CommunityPost, CommunityComment, User, ContentStatusEnum
 from utils.role_required import role_required
+from utils.schemas import parse_body, FlagContentIn, ResolveFlagIn, BulkFlagActionIn
+from utils.cache import cached_with_stale, bump_version
 
 moderation_bp = Blueprint('moderation_bp', __name__)
 
+# Number of characters of flagged content shown to moderators
+PREVIEW_LENGTH = 100
+
+
+def _preview(text, length):
+    if text is None:
+        return None
+    return text + "..." if length > PREVIEW_LENGTH else text
+
 #flag content (post or comment)
 @moderation_bp.route('/flag', methods=['POST'])
 @jwt_required()
 def flag_content():
     try:
-        current_user = get_jwt_identity()
-        user_id = current_user["id"]
+        user_id = int(get_jwt_identity())
         
-        data = request.get_json()
-        post_id = data.get("post_id")
-        comment_id = data.get("comment_id")
-        reason = data.get("reason", "").strip()
-        
-        if not reason:
-            return jsonify({"error": "Reason is required for flagging content"}), 400
-        
-        if not post_id and not comment_id:
-            return jsonify({"error": "Either post_id or comment_id is required"}), 400
+        data, error = parse_body(FlagContentIn)
+        if error:
+            return error
+        post_id = data.post_id
+        comment_id = data.comment_id
         
         # Check if content exists
         if post_id:
@@ -37,13 +43,15 @@ def flag_content():
                 return jsonify({"error": "Comment not found"}), 404
         
         # Check if user already flagged this content
-        existing_flag = ContentFlag.query.filter_by(
-            reporter_id=user_id,
-            post_id=post_id,
-            comment_id=comment_id
-        ).first()
+        already_flagged = db.session.query(
+            ContentFlag.query.filter_by(
+                reporter_id=user_id,
+                post_id=post_id,
+                comment_id=comment_id
+            ).exists()
+        ).scalar()
         
-        if existing_flag:
+        if already_flagged:
             return jsonify({"error": "You have already flagged this content"}), 400
         
         # Create flag
@@ -51,12 +59,13 @@ def flag_content():
             reporter_id=user_id,
             post_id=post_id,
             comment_id=comment_id,
-            reason=reason,
+            reason=data.reason,
             status=ContentStatusEnum.pending
         )
         
         db.session.add(flag)
         db.session.commit()
+        bump_version("moderation")
         
         return jsonify({
             "message": "Content flagged successfully for review",
@@ -76,7 +85,41 @@ def get_flagged_content():
         per_page = request.args.get('per_page', 20, type=int)
         status_filter = request.args.get('status', 'pending')  # pending, reviewed, all
         
-        query = ContentFlag.query
+        Reporter = aliased(User)
+        PostAuthor = aliased(User)
+        CommentAuthor = aliased(User)
+        CommentPost = aliased(CommunityPost)
+
+        # Truncate content in SQL so full post/comment bodies never leave the DB
+        query = db.session.query(
+            ContentFlag.id,
+            ContentFlag.reason,
+            ContentFlag.status,
+            ContentFlag.created_at,
+            ContentFlag.post_id,
+            Reporter.username.label("reporter_username"),
+            CommunityPost.title.label("post_title"),
+            func.substr(CommunityPost.content, 1, PREVIEW_LENGTH).label("post_preview"),
+            func.length(CommunityPost.content).label("post_length"),
+            PostAuthor.username.label("post_author"),
+            CommunityComment.id.label("comment_id"),
+            func.substr(CommunityComment.content, 1, PREVIEW_LENGTH).label("comment_preview"),
+            func.length(CommunityComment.content).label("comment_length"),
+            CommentAuthor.username.label("comment_author"),
+            CommentPost.title.label("comment_post_title")
+        ).outerjoin(
+            Reporter, Reporter.id == ContentFlag.reporter_id
+        ).outerjoin(
+            CommunityPost, CommunityPost.id == ContentFlag.post_id
+        ).outerjoin(
+            PostAuthor, PostAuthor.id == CommunityPost.author_id
+        ).outerjoin(
+            CommunityComment, CommunityComment.id == ContentFlag.comment_id
+        ).outerjoin(
+            CommentAuthor, CommentAuthor.id == CommunityComment.author_id
+        ).outerjoin(
+            CommentPost, CommentPost.id == CommunityComment.post_id
+        )
         
         if status_filter == 'pending':
             query = query.filter(ContentFlag.status == ContentStatusEnum.pending)
@@ -91,26 +134,26 @@ def get_flagged_content():
         for flag in flagged_content.items:
             flag_data = {
                 "flag_id": flag.id,
-                "reporter_username": flag.reporter.username,
+                "reporter_username": flag.reporter_username,
                 "reason": flag.reason,
                 "status": flag.status.value,
                 "created_at": flag.created_at.isoformat(),
                 "content_type": "post" if flag.post_id else "comment"
             }
             
-            if flag.post:
+            if flag.post_title is not None:
                 flag_data.update({
-                    "content_id": flag.post.id,
-                    "content_title": flag.post.title,
-                    "content_preview": flag.post.content[:100] + "..." if len(flag.post.content) > 100 else flag.post.content,
-                    "author_username": flag.post.author.username
+                    "content_id": flag.post_id,
+                    "content_title": flag.post_title,
+                    "content_preview": _preview(flag.post_preview, flag.post_length),
+                    "author_username": flag.post_author
                 })
-            elif flag.comment:
+            elif flag.comment_id is not None:
                 flag_data.update({
-                    "content_id": flag.comment.id,
-                    "content_preview": flag.comment.content[:100] + "..." if len(flag.comment.content) > 100 else flag.comment.content,
-                    "author_username": flag.comment.author.username,
-                    "post_title": flag.comment.post.title if flag.comment.post else "Unknown Post"
+                    "content_id": flag.comment_id,
+                    "content_preview": _preview(flag.comment_preview, flag.comment_length),
+                    "author_username": flag.comment_author,
+                    "post_title": flag.comment_post_title if flag.comment_post_title else "Unknown Post"
                 })
             
             content_data.append(flag_data)
@@ -130,17 +173,15 @@ def get_flagged_content():
 @role_required("admin")
 def resolve_flag(flag_id):
     try:
-        current_user = get_jwt_identity()
-        admin_id = current_user["id"]
+        admin_id = int(get_jwt_identity())
         
         flag = ContentFlag.query.get_or_404(flag_id)
-        data = request.get_json()
+        data, error = parse_body(ResolveFlagIn)
+        if error:
+            return error
         
-        action = data.get("action")  # "approve" or "reject"
-        admin_notes = data.get("admin_notes", "").strip()
-        
-        if action not in ["approve", "reject"]:
-            return jsonify({"error": "Action must be 'approve' or 'reject'"}), 400
+        action = data.action  # "approve" or "reject"
+        admin_notes = data.admin_notes
         
         if action == "approve":
             flag.status = ContentStatusEnum.approved
@@ -162,6 +203,7 @@ def resolve_flag(flag_id):
             flag.reason += f" | Admin Notes: {admin_notes}"
         
         db.session.commit()
+        bump_version("moderation")
         
         return jsonify({
             "message": message,
@@ -173,52 +215,68 @@ def resolve_flag(flag_id):
         db.session.rollback()
         return jsonify({"error": f"Failed to resolve flag: {str(e)}"}), 500
 
+def _moderation_stats():
+    """Counters, top reporters and recent activity for the moderation dashboard."""
+    # All four counters in one pass over the flags
+    total_flags, pending_flags, approved_flags, rejected_flags = db.session.execute(
+        select(
+            func.count(ContentFlag.id),
+            func.count(case((ContentFlag.status == ContentStatusEnum.pending, ContentFlag.id))),
+            func.count(case((ContentFlag.status == ContentStatusEnum.approved, ContentFlag.id))),
+            func.count(case((ContentFlag.status == ContentStatusEnum.rejected, ContentFlag.id)))
+        )
+    ).one()
+    
+    # Top reporters
+    top_reporters = db.session.query(
+        User.username,
+        func.count(ContentFlag.id).label('flags_count')
+    ).join(ContentFlag, User.id == ContentFlag.reporter_id).group_by(
+        User.id, User.username
+    ).order_by(func.count(ContentFlag.id).desc()).limit(10).all()
+    
+    # Recent moderation activity (plain columns, reporter joined in)
+    recent_activity = db.session.query(
+        ContentFlag.id,
+        User.username,
+        ContentFlag.status,
+        ContentFlag.created_at
+    ).join(User, User.id == ContentFlag.reporter_id).filter(
+        ContentFlag.status.in_([ContentStatusEnum.approved, ContentStatusEnum.rejected])
+    ).order_by(ContentFlag.created_at.desc()).limit(10).all()
+    
+    return {
+        "statistics": {
+            "total_flags": total_flags,
+            "pending_flags": pending_flags,
+            "approved_flags": approved_flags,
+            "rejected_flags": rejected_flags,
+            "approval_rate": round((approved_flags / total_flags) * 100, 2) if total_flags > 0 else 0
+        },
+        "top_reporters": [
+            {"username": username, "flags_count": count}
+            for username, count in top_reporters
+        ],
+        "recent_activity": [
+            {
+                "flag_id": flag_id,
+                "reporter": reporter,
+                "action": status.value,
+                "resolved_at": created_at.isoformat()
+            }
+            for flag_id, reporter, status, created_at in recent_activity
+        ]
+    }
+
+
 # ADMIN: Get moderation statistics
 @moderation_bp.route('/admin/stats', methods=['GET'])
 @jwt_required()
 @role_required("admin")
 def get_moderation_stats():
     try:
-        total_flags = ContentFlag.query.count()
-        pending_flags = ContentFlag.query.filter_by(status=ContentStatusEnum.pending).count()
-        approved_flags = ContentFlag.query.filter_by(status=ContentStatusEnum.approved).count()
-        rejected_flags = ContentFlag.query.filter_by(status=ContentStatusEnum.rejected).count()
-        
-        # Top reporters
-        top_reporters = db.session.query(
-            User.username,
-            func.count(ContentFlag.id).label('flags_count')
-        ).join(ContentFlag, User.id == ContentFlag.reporter_id).group_by(
-            User.id, User.username
-        ).order_by(func.count(ContentFlag.id).desc()).limit(10).all()
-        
-        # Recent moderation activity
-        recent_activity = ContentFlag.query.filter(
-            ContentFlag.status.in_([ContentStatusEnum.approved, ContentStatusEnum.rejected])
-        ).order_by(ContentFlag.created_at.desc()).limit(10).all()
-        
-        return jsonify({
-            "statistics": {
-                "total_flags": total_flags,
-                "pending_flags": pending_flags,
-                "approved_flags": approved_flags,
-                "rejected_flags": rejected_flags,
-                "approval_rate": round((approved_flags / total_flags) * 100, 2) if total_flags > 0 else 0
-            },
-            "top_reporters": [
-                {"username": username, "flags_count": count}
-                for username, count in top_reporters
-            ],
-            "recent_activity": [
-                {
-                    "flag_id": flag.id,
-                    "reporter": flag.reporter.username,
-                    "action": flag.status.value,
-                    "resolved_at": flag.created_at.isoformat()
-                }
-                for flag in recent_activity
-            ]
-        }), 200
+        stats = cached_with_stale("moderation:stats", "normal", _moderation_stats, version="moderation")
+        return jsonify(stats), 200
     except Exception as e:
         return jsonify({"error": f"Failed to load moderation stats: {str(e)}"}), 500
 
@@ -229,17 +287,13 @@ def get_moderation_stats():
 def bulk_action_flags():
     try:
         current_user = get_jwt_identity()
-        data = request.get_json()
-        
-        flag_ids = data.get("flag_ids", [])
-        action = data.get("action")  # "approve" or "reject"
-        admin_notes = data.get("admin_notes", "")
-        
-        if not flag_ids:
-            return jsonify({"error": "No flag IDs provided"}), 400
+        data, error = parse_body(BulkFlagActionIn)
+        if error:
+            return error
         
-        if action not in ["approve", "reject"]:
-            return jsonify({"error": "Action must be 'approve' or 'reject'"}), 400
+        flag_ids = data.flag_ids
+        action = data.action  # "approve" or "reject"
+        admin_notes = data.admin_notes
         
         flags = ContentFlag.query.filter(ContentFlag.id.in_(flag_ids)).all()
         
@@ -260,6 +314,7 @@ def bulk_action_flags():
             processed += 1
         
         db.session.commit()
+        bump_version("moderation")
         
         return jsonify({
             "message": f"Processed {processed} flags with action: {action}",
@@ -1,10 +1,25 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
+from sqlalchemy import func
 from models import db, Module, LearningResource, LearningPath
 from utils.role_required import role_required
+from utils.schemas import parse_body, CreateResourceIn
+from utils.etags import make_etag, not_modified
 
 modules_bp = Blueprint("modules_bp", __name__)
 
+
+def _resource_dict(resource):
+    return {
+        "id": resource.id,
+        "title": resource.title,
+        "type": resource.type,
+        "url": resource.url,
+        "description": resource.description,
+        "module_id": resource.module_id
+    }
+
+
 #Get all modules for a specific learning path
 @modules_bp.route("/learning-paths/<int:path_id>/modules", methods=["GET"])
 @jwt_required()
@@ -14,8 +29,25 @@ def get_modules_by_path(path_id):
     if not learning_path:
         return jsonify({"error": "Learning path not found"}), 404
 
-    modules = Module.query.filter_by(path_id=path_id).all()
-    return jsonify([m.to_dict() for m in modules]), 200
+    query = Module.query.filter_by(learning_path_id=path_id)
+    last_updated, total = query.with_entities(func.max(Module.updated_at), func.count(Module.id)).one()
+    etag = make_etag("modules", path_id, total, last_updated)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    modules = query.order_by(Module.id).all()
+    response = jsonify([
+        {
+            "id": m.id,
+            "title": m.title,
+            "description": m.description,
+            "learning_path_id": m.learning_path_id,
+            "created_at": m.created_at.isoformat() if m.created_at else None
+        } for m in modules
+    ])
+    response.set_etag(etag, weak=True)
+    return response
 
 
 #Get all resources for a specific module
@@ -28,27 +60,31 @@ def get_module_resources(module_id):
         return jsonify({"error": "Module not found"}), 404
 
     resources = LearningResource.query.filter_by(module_id=module_id).all()
-    return jsonify([r.to_dict() for r in resources]), 200
+    return jsonify([_resource_dict(r) for r in resources]), 200
 
 
 #Create a new resource for a module (Admin or Contributor)
 @modules_bp.route("/modules/<int:module_id>/resources", methods=["POST"])
-@role_required(["admin", "contributor"])
+@jwt_required()
+@role_required("admin", "contributor")
 def create_resource(module_id):
     """Add a new learning resource to a module."""
-    data = request.get_json() or {}
-    title = data.get("title")
-    url = data.get("url")
-
-    if not title or not url:
-        return jsonify({"error": "Both title and URL are required"}), 400
+    data, error = parse_body(CreateResourceIn)
+    if error:
+        return error
 
     module = Module.query.get(module_id)
     if not module:
         return jsonify({"error": "Module not found"}), 404
 
-    new_resource = LearningResource(title=title, url=url, module_id=module_id)
+    new_resource = LearningResource(
+        title=data.title,
+        type=data.type,
+        url=data.url,
+        description=data.description,
+        module_id=module_id
+    )
     db.session.add(new_resource)
     db.session.commit()
 
-    return jsonify(new_resource.to_dict()), 201
+    return jsonify(_resource_dict(new_resource)), 201
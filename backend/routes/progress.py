@@ -1,8 +1,10 @@
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
-from models import db, User, Module, UserProgress, LearningPath
+from sqlalchemy import exists, select
+from models import db, User, Module, UserProgress, LearningPath, path_followers
 from services.core_services import PointsService
+from utils.cache import invalidate_profile
 
 
 progress_bp = Blueprint('progress_bp', __name__)
@@ -12,13 +14,21 @@ progress_bp = Blueprint('progress_bp', __name__)
 @jwt_required()
 def complete_module(module_id):
     try:
-        current_user = get_jwt_identity()
+        user_id = int(get_jwt_identity())
         module = Module.query.get_or_404(module_id)
-        user = User.query.get(current_user["id"])
 
-        if module.learning_path not in user.followed_paths:
+        # EXISTS on the association row instead of loading every followed path
+        is_following = db.session.scalar(
+            select(exists().where(
+                path_followers.c.user_id == user_id,
+                path_followers.c.path_id == module.learning_path_id
+            ))
+        )
+        if not is_following:
             return jsonify({"error": "You must follow the path"}), 400
 
+        # Points are applied to the loaded user, so fetch it only once it is needed
+        user = db.session.get(User, user_id)
         progress = UserProgress.query.filter_by(user_id=user.id, module_id=module_id).first()
         if not progress:
             progress = UserProgress(user_id=user.id, module_id=module_id, completion_percent=100, completed_at=datetime.utcnow())
@@ -27,8 +37,10 @@ def complete_module(module_id):
             progress.completion_percent = 100
             progress.completed_at = datetime.utcnow()
 
-        db.session.commit()
+        # Progress, points, badges and rank go out in one transaction
         PointsService.award_points(user, 'complete_module')
+        db.session.commit()
+        invalidate_profile(user.id)
         return jsonify({
             "message": "Module completed",
             "progress": {"module_id": module.id, "completion_percent": 100}
@@ -41,23 +53,31 @@ def complete_module(module_id):
 @progress_bp.route('/paths/<int:path_id>/progress', methods=['GET'])
 @jwt_required()
 def get_path_progress(path_id):
-    current_user = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     path = LearningPath.query.get_or_404(path_id)
-    total_completion = 0
-    progress_data = []
 
-    for m in path.modules:
-        user_progress = UserProgress.query.filter_by(user_id=current_user["id"], module_id=m.id).first()
-        completion = user_progress.completion_percent if user_progress else 0
-        total_completion += completion
-        progress_data.append({
-            "module_id": m.id,
-            "module_title": m.title,
-            "completion_percent": completion,
-            "completed_at": user_progress.completed_at.isoformat() if user_progress and user_progress.completed_at else None
-        })
+    # Every module of the path with this user's progress (if any) in one query
+    rows = db.session.execute(
+        select(Module.id, Module.title, UserProgress.completion_percent, UserProgress.completed_at)
+        .select_from(Module)
+        .outerjoin(
+            UserProgress,
+            (UserProgress.module_id == Module.id) & (UserProgress.user_id == user_id)
+        )
+        .where(Module.learning_path_id == path.id)
+        .order_by(Module.id)
+    ).all()
+
+    progress_data = [
+        {
+            "module_id": row.id,
+            "module_title": row.title,
+            "completion_percent": row.completion_percent or 0,
+            "completed_at": row.completed_at.isoformat() if row.completed_at else None
+        } for row in rows
+    ]
 
-    overall = total_completion / len(path.modules) if path.modules.count() > 0 else 0
+    overall = sum(p["completion_percent"] for p in progress_data) / len(rows) if rows else 0
     return jsonify({
         "path_id": path.id,
         "path_title": path.title,
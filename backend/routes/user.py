@@ -1,20 +1,40 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, json, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import bindparam, select
 from models import db, User, UserProgress
 from utils.role_required import role_required
+from utils.cache import cache, profile_cache_key, invalidate_profile, revoke_user_tokens, PROFILE_TIMEOUT
+from utils.etags import etag_from_body
 
 user_bp = Blueprint("user", __name__)
 
+# Users fetched per keyset page while streaming /all
+USER_BATCH_SIZE = 500
+
+# Built once at import; each request only binds :uid
+PROFILE_USER_STMT = select(
+    User.id, User.username, User.email, User.role, User.created_at,
+    User.streak_days, User.points, User.xp
+).where(User.id == bindparam("uid"))
+
+PROFILE_PROGRESS_STMT = select(
+    UserProgress.module_id, UserProgress.completion_percent,
+    UserProgress.last_score, UserProgress.completed_at
+).where(UserProgress.user_id == bindparam("uid"))
+
 # GET Current User Profile
 @user_bp.route("/profile", methods=["GET"])
 @jwt_required()
+@etag_from_body
+@cache.cached(timeout=PROFILE_TIMEOUT, key_prefix=lambda: profile_cache_key(get_jwt_identity()))
 def get_profile():
     current_user_id = int(get_jwt_identity())  
-    user = User.query.get(current_user_id)
+    # Only the rendered columns; the password hash and ORM instances are never loaded
+    user = db.session.execute(PROFILE_USER_STMT, {"uid": current_user_id}).one_or_none()
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    progress = UserProgress.query.filter_by(user_id=user.id).all()
+    progress = db.session.execute(PROFILE_PROGRESS_STMT, {"uid": user.id}).all()
 
     return jsonify({
         "id": user.id,
@@ -51,16 +71,17 @@ def update_profile():
         if len(new_username) < 3:
             return jsonify({"error": "Username must be at least 3 characters"}), 400
 
-        if User.query.filter(User.username == new_username, User.id != user.id).first():
+        if db.session.query(User.query.filter(User.username == new_username, User.id != user.id).exists()).scalar():
             return jsonify({"error": "Username already taken"}), 409
         user.username = new_username
 
     if new_email:
-        if User.query.filter(User.email == new_email, User.id != user.id).first():
+        if db.session.query(User.query.filter(User.email == new_email, User.id != user.id).exists()).scalar():
             return jsonify({"error": "Email already in use"}), 409
         user.email = new_email
 
     db.session.commit()
+    invalidate_profile(user.id)
     return jsonify({"message": "Profile updated successfully"}), 200
 
 
@@ -76,6 +97,8 @@ def delete_account():
 
     db.session.delete(user)
     db.session.commit()
+    invalidate_profile(current_user_id)
+    revoke_user_tokens(current_user_id)
     return jsonify({"message": "Account deleted successfully"}), 200
 
 
@@ -84,14 +107,31 @@ def delete_account():
 @jwt_required()
 @role_required("admin")
 def get_all_users():
-    users = User.query.all()
-    return jsonify([
-        {
-            "id": u.id,
-            "username": u.username,
-            "email": u.email,
-            "role": u.role.value,
-            "points": u.points,
-            "xp": u.xp
-        } for u in users
-    ]), 200
+    def generate():
+        # Keyset pages on the primary key; only the listed columns, no ORM objects
+        last_id = 0
+        separator = ""
+        yield "["
+        while True:
+            rows = db.session.execute(
+                select(User.id, User.username, User.email, User.role, User.points, User.xp)
+                .where(User.id > last_id)
+                .order_by(User.id)
+                .limit(USER_BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            for u in rows:
+                yield separator + json.dumps({
+                    "id": u.id,
+                    "username": u.username,
+                    "email": u.email,
+                    "role": u.role.value,
+                    "points": u.points,
+                    "xp": u.xp
+                })
+                separator = ","
+            last_id = rows[-1].id
+        yield "]"
+
+    return Response(stream_with_context(generate()), status=200, mimetype="application/json")
@@ -4,9 +4,19 @@ from models import (
     CommunityPost, CommunityComment, UserProgress, UserBadge, Leaderboard,
     ContentStatusEnum
 )
+from sqlalchemy import insert
 from werkzeug.security import generate_password_hash
 from datetime import datetime
 
+
+def insert_rows(model, rows):
+    """Insert `rows` in one statement and return their new ids in the same order."""
+    return db.session.scalars(
+        insert(model).returning(model.id, sort_by_parameter_order=True),
+        rows
+    ).all()
+
+
 with app.app_context():
     # Drop and recreate all tables
     db.drop_all()
@@ -14,7 +24,7 @@ with app.app_context():
 
     # USERS
     users = [
-        User(
+        dict(
             username="admin",
             email="admin@learnplatform.com",
             password_hash=generate_password_hash("admin123"),
@@ -22,7 +32,7 @@ with app.app_context():
             points=1500,
             xp=2500
         ),
-        User(
+        dict(
             username="creator",
             email="creator@learnplatform.com",
             password_hash=generate_password_hash("creator123"),
@@ -30,7 +40,7 @@ with app.app_context():
             points=700,
             xp=1200
         ),
-        User(
+        dict(
             username="learner",
             email="learner@learnplatform.com",
             password_hash=generate_password_hash("learner123"),
@@ -39,121 +49,99 @@ with app.app_context():
             xp=600
         )
     ]
-    db.session.add_all(users)
-    db.session.commit()
+    user_ids = insert_rows(User, users)
 
-    admin = users[0]
-    contributor = users[1]
-    learner = users[2]
+    admin_id = user_ids[0]
+    contributor_id = user_ids[1]
+    learner_id = user_ids[2]
 
     # BADGES
-    badges = [
-        Badge(key="first_login", name="First Login", description="Welcome!"),
-        Badge(key="first_module", name="Module Explorer", description="Completed first module"),
-        Badge(key="streak_7_days", name="Weekly Warrior", description="7-day streak")
-    ]
-    db.session.add_all(badges)
-    db.session.commit()
+    badge_ids = insert_rows(Badge, [
+        dict(key="first_login", name="First Login", description="Welcome!"),
+        dict(key="first_module", name="Module Explorer", description="Completed first module"),
+        dict(key="streak_7_days", name="Weekly Warrior", description="7-day streak")
+    ])
 
     # LEARNING PATHS
-    paths = [
-        LearningPath(
+    path_ids = insert_rows(LearningPath, [
+        dict(
             title="Python Fundamentals",
             description="Learn Python basics",
-            creator_id=contributor.id,
+            creator_id=contributor_id,
             status=ContentStatusEnum.approved,
             is_published=True
         )
-    ]
-    db.session.add_all(paths)
-    db.session.commit()
+    ])
 
     # MODULES
-    modules = [
-        Module(
+    module_ids = insert_rows(Module, [
+        dict(
             title="Intro to Python",
             description="Variables, data types, syntax",
-            learning_path_id=paths[0].id
+            learning_path_id=path_ids[0]
         )
-    ]
-    db.session.add_all(modules)
-    db.session.commit()
+    ])
 
     # QUIZZES
-    quizzes = [
-        Quiz(
+    quiz_ids = insert_rows(Quiz, [
+        dict(
             title="Python Basics Quiz",
-            module_id=modules[0].id
+            module_id=module_ids[0]
         )
-    ]
-    db.session.add_all(quizzes)
-    db.session.commit()
+    ])
 
     # QUESTIONS + CHOICES
-    questions = [
-        Question(
-            quiz_id=quizzes[0].id,
+    question_ids = insert_rows(Question, [
+        dict(
+            quiz_id=quiz_ids[0],
             text="What is the correct way to declare a variable in Python?"
         ),
-        Question(
-            quiz_id=quizzes[0].id,
+        dict(
+            quiz_id=quiz_ids[0],
             text="Which keyword is used to define a function?"
         )
-    ]
-    db.session.add_all(questions)
-    db.session.commit()
+    ])
 
-    choices = [
-        Choice(question_id=questions[0].id, text="x = 5", is_correct=True),
-        Choice(question_id=questions[0].id, text="int x = 5", is_correct=False),
-        Choice(question_id=questions[1].id, text="def", is_correct=True),
-        Choice(question_id=questions[1].id, text="function", is_correct=False)
-    ]
-    db.session.add_all(choices)
-    db.session.commit()
+    insert_rows(Choice, [
+        dict(question_id=question_ids[0], text="x = 5", is_correct=True),
+        dict(question_id=question_ids[0], text="int x = 5", is_correct=False),
+        dict(question_id=question_ids[1], text="def", is_correct=True),
+        dict(question_id=question_ids[1], text="function", is_correct=False)
+    ])
 
     # COMMUNITY POSTS + COMMENTS
-    posts = [
-        CommunityPost(
+    post_ids = insert_rows(CommunityPost, [
+        dict(
             title="How to learn Flask?",
             content="Any tips for beginners?",
-            author_id=learner.id
+            author_id=learner_id
         )
-    ]
-    db.session.add_all(posts)
-    db.session.commit()
+    ])
 
-    comments = [
-        CommunityComment(
+    insert_rows(CommunityComment, [
+        dict(
             content="Check Flask documentation and tutorials!",
-            author_id=contributor.id,
-            post_id=posts[0].id
+            author_id=contributor_id,
+            post_id=post_ids[0]
         )
-    ]
-    db.session.add_all(comments)
-    db.session.commit()
+    ])
 
     # USER PROGRESS
-    progress = [
-        UserProgress(user_id=learner.id, module_id=modules[0].id, completion_percent=50)
-    ]
-    db.session.add_all(progress)
-    db.session.commit()
+    insert_rows(UserProgress, [
+        dict(user_id=learner_id, module_id=module_ids[0], completion_percent=50)
+    ])
 
     # USER BADGES
-    user_badges = [
-        UserBadge(user_id=learner.id, badge_id=badges[0].id)
-    ]
-    db.session.add_all(user_badges)
-    db.session.commit()
+    insert_rows(UserBadge, [
+        dict(user_id=learner_id, badge_id=badge_ids[0])
+    ])
 
-    # LEADERBOARD
-    leaderboard_entries = [
-        Leaderboard(user_id=u.id, total_points=u.points)
-        for u in users
-    ]
-    db.session.add_all(leaderboard_entries)
+    # LEADERBOARD (ranked here, the seed data is already in memory; ties share a rank like RANK())
+    all_points = [u["points"] for u in users]
+    insert_rows(Leaderboard, [
+        dict(user_id=user_id, total_points=u["points"], rank=1 + sum(p > u["points"] for p in all_points))
+        for user_id, u in zip(user_ids, users)
+    ])
     db.session.commit()
-    Leaderboard.update_leaderboard()
 
     print("Database seeded successfully!")
@@ -1,5 +1,7 @@
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import event, exists, func, select, update
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy.orm.attributes import set_committed_value
 from models import (
     db,
     User,
@@ -13,14 +15,36 @@ from models import (
     Leaderboard
 )
 from utils.constants import POINTS_CONFIG, XP_CONFIG, BADGE_RULES
+from utils.cache import cached_with_stale, bump_version_on_change, bump_version_on_commit
+
+# Leaderboard caches go stale only when a commit actually reorders players
+bump_version_on_change("leaderboard")
+
+# Badge key -> id, per process; only ids of committed badges get in here
+_badge_ids = {}
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_new_badge_ids(session):
+    _badge_ids.update(session.info.pop("new_badge_ids", {}))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_new_badge_ids(session):
+    session.info.pop("new_badge_ids", None)
 
 
 class PointsService:
     """Handles awarding of points and XP for user actions."""
 
     @staticmethod
-    def award_points(user, action, metadata=None):
-        """Award points and XP for a given user action."""
+    def award_points(user, action, metadata=None, _skip_badges=False):
+        """Award points and XP for a given user action.
+
+        Does not commit: the route commits once for the whole request.
+        `_skip_badges` is set when the award itself comes from a badge, so badge
+        points do not re-run every badge check.
+        """
         if action not in POINTS_CONFIG:
             raise ValueError(f"Unknown action: {action}")
 
@@ -28,9 +52,7 @@ class PointsService:
         xp = XP_CONFIG.get(action, 0)
 
         # Update user stats
-        user.points = (user.points or 0) + points
-        if xp > 0:
-            user.xp = (user.xp or 0) + xp
+        PointsService._add_to_user(user, points=points, xp=xp)
 
         # Log the transaction
         points_log = PointsLog(
@@ -41,13 +63,11 @@ class PointsService:
         db.session.add(points_log)
 
         # Check for badge unlocks
-        awarded_badges = BadgeService.check_badges(user, action)
+        awarded_badges = [] if _skip_badges else BadgeService.check_badges(user, action)
 
         # Update leaderboard
         LeaderboardService.update_user_rank(user)
 
-        db.session.commit()
-
         return {
             "points": points,
             "xp": xp,
@@ -59,10 +79,26 @@ class PointsService:
     def award_xp_only(user, action, metadata=None):
         xp = XP_CONFIG.get(action, 0)
         if xp > 0:
-            user.xp = (user.xp or 0) + xp
-            db.session.commit()
+            PointsService._add_to_user(user, xp=xp)
         return {"xp": xp, "action": action}
 
+    @staticmethod
+    def _add_to_user(user, points=0, xp=0):
+        """Increment points/xp in the database, not from the in-memory values.
+
+        Concurrent awards can no longer overwrite each other. The new totals come
+        back via RETURNING and are set on `user` without marking it dirty.
+        """
+        row = db.session.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(points=User.points + points, xp=User.xp + xp)
+            .returning(User.points, User.xp),
+            execution_options={"synchronize_session": False}
+        ).one()
+        set_committed_value(user, "points", row.points)
+        set_committed_value(user, "xp", row.xp)
+
     @staticmethod
     def award_daily_login(user):
         user.update_streak()  # Ensure User model has this method
@@ -85,6 +121,7 @@ class BadgeService:
        
 
         awarded_badges = []
+        owned = BadgeService._owned_badge_keys(user.id)
 
         # Direct trigger badges
         trigger_map = {
@@ -96,79 +133,85 @@ class BadgeService:
 
         if action in trigger_map:
             badge_key = trigger_map[action]
-            if not BadgeService.has_badge(user, badge_key):
+            if badge_key not in owned:
                 BadgeService.award_badge(user, badge_key)
                 awarded_badges.append(badge_key)
 
         # Check milestone badges
-        awarded_badges.extend(BadgeService._check_milestone_badges(user))
+        awarded_badges.extend(BadgeService._check_milestone_badges(user, owned))
 
         return awarded_badges
 
     @staticmethod
-    def _check_milestone_badges(user):
+    def _check_milestone_badges(user, owned=None):
         """Evaluate milestone-based badges."""
         badges = []
+        if owned is None:
+            owned = BadgeService._owned_badge_keys(user.id)
 
-        # Module Explorer: 5 completed modules
+        # Module and quiz milestones both count fully completed progress rows
         completed_modules = UserProgress.query.filter_by(
             user_id=user.id, completion_percent=100
         ).count()
-        if completed_modules >= 5 and not BadgeService.has_badge(user, "module_explorer"):
-            BadgeService.award_badge(user, "module_explorer")
-            badges.append("module_explorer")
-
-        # Streak badge
-        if user.streak_days >= 30 and not BadgeService.has_badge(user, "streak_30_days"):
-            BadgeService.award_badge(user, "streak_30_days")
-            badges.append("streak_30_days")
-
-        # Path Completer
-        if BadgeService._get_completed_learning_paths(user) >= 1 and not BadgeService.has_badge(user, "path_completer"):
-            BadgeService.award_badge(user, "path_completer")
-            badges.append("path_completer")
-
-        # Quiz Master: 10 perfect quizzes
-        perfect_quizzes = UserProgress.query.filter_by(
-            user_id=user.id, completion_percent=100
-        ).count()
-        if perfect_quizzes >= 10 and not BadgeService.has_badge(user, "quiz_master"):
-            BadgeService.award_badge(user, "quiz_master")
-            badges.append("quiz_master")
+        completed_paths = BadgeService._get_completed_learning_paths(user)
 
-        # Subject Master: all modules in a path completed
-        if BadgeService._has_completed_full_path(user):
-            BadgeService.award_badge(user, "subject_master")
-            badges.append("subject_master")
+        milestones = [
+            # Module Explorer: 5 completed modules
+            ("module_explorer", completed_modules >= 5),
+            # Streak badge
+            ("streak_30_days", user.streak_days >= 30),
+            # Path Completer
+            ("path_completer", completed_paths >= 1),
+            # Quiz Master: 10 perfect quizzes
+            ("quiz_master", completed_modules >= 10),
+            # Subject Master: all modules in a path completed
+            ("subject_master", completed_paths > 0),
+        ]
+
+        for badge_key, earned in milestones:
+            if earned and badge_key not in owned:
+                BadgeService.award_badge(user, badge_key)
+                badges.append(badge_key)
 
         return badges
 
     @staticmethod
     def _get_completed_learning_paths(user):
         """Count completed learning paths (all modules complete)."""
+        return db.session.scalar(BadgeService._completed_paths_count(user.id))
+
+    @staticmethod
+    def _completed_paths_count(user_id):
+        """SELECT counting the paths whose every module the user has completed."""
+        module_counts = (
+            select(Module.learning_path_id, func.count(Module.id).label("n"))
+            .group_by(Module.learning_path_id)
+            .subquery()
+        )
         user_paths = (
-            db.session.query(LearningPath.id)
-            .join(Module)
-            .join(UserProgress)
-            .filter(
-                UserProgress.user_id == user.id,
+            select(Module.learning_path_id)
+            .join(UserProgress, UserProgress.module_id == Module.id)
+            .join(module_counts, module_counts.c.learning_path_id == Module.learning_path_id)
+            .where(
+                UserProgress.user_id == user_id,
                 UserProgress.completion_percent == 100
             )
-            .group_by(LearningPath.id)
-            .having(
-                func.count(Module.id)
-                == db.session.query(func.count(Module.id))
-                .filter(Module.learning_path_id == LearningPath.id)
-                .correlate(LearningPath)
-                .scalar_subquery()
-            )
-            .count()
+            .group_by(Module.learning_path_id, module_counts.c.n)
+            .having(func.count(func.distinct(Module.id)) == module_counts.c.n)
+            .subquery()
         )
-        return user_paths
+        return select(func.count()).select_from(user_paths)
 
     @staticmethod
-    def _has_completed_full_path(user):
-        return BadgeService._get_completed_learning_paths(user) > 0
+    def _owned_badge_keys(user_id):
+        """Keys of every badge the user already holds."""
+        rows = (
+            db.session.query(Badge.key)
+            .join(UserBadge)
+            .filter(UserBadge.user_id == user_id)
+            .all()
+        )
+        return {key for (key,) in rows}
 
     @staticmethod
     def has_badge(user, badge_key):
@@ -179,6 +222,26 @@ class BadgeService:
             is not None
         )
 
+    @staticmethod
+    def _badge_id_by_key(badge_key):
+        """Badge ids never change once created, so keep them per process.
+
+        A badge created by this transaction is served from the session until
+        it commits, and only then cached; a rollback leaves no dangling id.
+        A missing badge raises LookupError and is not cached, so a badge
+        created later (by any worker) is picked up on the next call.
+        """
+        pending = db.session.info.get("new_badge_ids", {})
+        if badge_key in pending:
+            return pending[badge_key]
+        if badge_key in _badge_ids:
+            return _badge_ids[badge_key]
+        badge_id = db.session.scalar(select(Badge.id).where(Badge.key == badge_key))
+        if badge_id is None:
+            raise LookupError(badge_key)
+        _badge_ids[badge_key] = badge_id
+        return badge_id
+
     @staticmethod
     def award_badge(user, badge_key):
         """Grant a badge to a user."""
@@ -186,8 +249,9 @@ class BadgeService:
         if not rule:
             raise ValueError(f"Badge '{badge_key}' not defined in BADGE_RULES")
 
-        badge = Badge.query.filter_by(key=badge_key).first()
-        if not badge:
+        try:
+            badge_id = BadgeService._badge_id_by_key(badge_key)
+        except LookupError:
             badge = Badge(
                 key=badge_key,
                 name=rule["name"],
@@ -195,29 +259,50 @@ class BadgeService:
             )
             db.session.add(badge)
             db.session.flush()
+            badge_id = badge.id
+            db.session.info.setdefault("new_badge_ids", {})[badge_key] = badge_id
 
         user_badge = UserBadge(
             user_id=user.id,
-            badge_id=badge.id,
+            badge_id=badge_id,
             awarded_at=datetime.utcnow()
         )
         db.session.add(user_badge)
 
         # Award points for earning a badge
-        PointsService.award_points(user, 'earn_badge', f"Badge: {badge_key}")
+        PointsService.award_points(user, 'earn_badge', f"Badge: {badge_key}", _skip_badges=True)
 
         return badge_key
 
     @staticmethod
     def get_user_badge_progress(user_id):
         """Return a user's progress toward each badge."""
-        user = User.query.get(user_id)
         progress = {}
 
-        # Module badges
-        completed_modules = UserProgress.query.filter_by(
-            user_id=user_id, completion_percent=100
-        ).count()
+        # Every counter the badges need, fetched in one round-trip
+        completed_count = (
+            select(func.count(UserProgress.id))
+            .where(UserProgress.user_id == user_id, UserProgress.completion_percent == 100)
+            .scalar_subquery()
+        )
+        created_count = (
+            select(func.count(LearningPath.id))
+            .where(LearningPath.creator_id == user_id)
+            .scalar_subquery()
+        )
+        stats = db.session.execute(
+            select(
+                User.streak_days,
+                completed_count.label("completed_modules"),
+                created_count.label("created_paths"),
+                BadgeService._completed_paths_count(user_id).scalar_subquery().label("completed_paths")
+            ).where(User.id == user_id)
+        ).one_or_none()
+        if stats is None:
+            return progress
+
+        # Module and quiz badges share the completed progress count
+        completed_modules = stats.completed_modules
         progress["first_module"] = completed_modules >= 1
         progress["module_explorer"] = {
             "current": completed_modules,
@@ -225,26 +310,20 @@ class BadgeService:
             "completed": completed_modules >= 5
         }
 
-        # Quiz badges
-        completed_quizzes = UserProgress.query.filter_by(
-            user_id=user_id, completion_percent=100
-        ).count()
-        progress["first_quiz"] = completed_quizzes >= 1
+        progress["first_quiz"] = completed_modules >= 1
         progress["quiz_master"] = {
-            "current": completed_quizzes,
+            "current": completed_modules,
             "target": 10,
-            "completed": completed_quizzes >= 10
+            "completed": completed_modules >= 10
         }
 
         # Learning path badges
-        created_paths = LearningPath.query.filter_by(creator_id=user_id).count()
-        completed_paths = BadgeService._get_completed_learning_paths(user)
-        progress["first_learning_path"] = created_paths >= 1
-        progress["path_completer"] = completed_paths >= 1
-        progress["subject_master"] = BadgeService._has_completed_full_path(user)
+        progress["first_learning_path"] = stats.created_paths >= 1
+        progress["path_completer"] = stats.completed_paths >= 1
+        progress["subject_master"] = stats.completed_paths >= 1
 
         # Streak badges
-        progress["streak_30_days"] = user.streak_days >= 30
+        progress["streak_30_days"] = (stats.streak_days or 0) >= 30
 
         return progress
 
@@ -252,40 +331,133 @@ class BadgeService:
 class LeaderboardService:
     @staticmethod
     def update_user_rank(user):
+        """Sync this user's total; ranks are computed from total_points when read."""
         entry = Leaderboard.query.filter_by(user_id=user.id).first()
         if not entry:
             entry = Leaderboard(user_id=user.id, total_points=user.points)
             db.session.add(entry)
-        else:
-            entry.total_points = user.points
+            bump_version_on_commit("leaderboard")
+            return
 
-        LeaderboardService.update_all_ranks()
+        old_points, entry.total_points = entry.total_points, user.points
+        if LeaderboardService._crosses_neighbor(user.id, old_points, user.points):
+            bump_version_on_commit("leaderboard")
+
+    @staticmethod
+    def _crosses_neighbor(user_id, old_points, new_points):
+        """True if moving from old_points to new_points passes (or ties) anyone else."""
+        if old_points == new_points:
+            return False
+        low, high = sorted((old_points, new_points))
+        return db.session.query(
+            exists().where(
+                Leaderboard.user_id != user_id,
+                Leaderboard.total_points.between(low, high)
+            )
+        ).scalar()
 
     @staticmethod
     def update_all_ranks():
-        entries = Leaderboard.query.order_by(Leaderboard.total_points.desc()).all()
-        for rank, entry in enumerate(entries, start=1):
-            entry.rank = rank
-        db.session.commit()
+        """Persist a rank snapshot with a single RANK() UPDATE ... FROM statement.
+
+        Uses the same tie rule as ranked_entries(), which is what the API
+        serves; the stored column is only a snapshot refreshed here.
+        """
+        ranked = select(
+            Leaderboard.id,
+            func.rank().over(order_by=Leaderboard.total_points.desc()).label("rank")
+        ).subquery()
+        db.session.execute(
+            update(Leaderboard)
+            .where(Leaderboard.id == ranked.c.id)
+            .values(rank=ranked.c.rank),
+            execution_options={"synchronize_session": False}
+        )
 
     @staticmethod
-    def get_top_users(limit=10):
-        return (
-            Leaderboard.query.join(User)
-            .order_by(Leaderboard.rank)
-            .limit(limit)
+    def ranked_entries(min_rank=None, max_rank=None):
+        """Query of (Leaderboard, rank) pairs ranked live with RANK() over total_points."""
+        ranked = select(
+            Leaderboard.id,
+            func.rank().over(order_by=Leaderboard.total_points.desc()).label("rank")
+        ).subquery()
+        query = (
+            db.session.query(Leaderboard, ranked.c.rank)
+            .join(ranked, ranked.c.id == Leaderboard.id)
+            .join(User)
+            .options(contains_eager(Leaderboard.user))
+        )
+        if min_rank is not None:
+            query = query.filter(ranked.c.rank >= min_rank)
+        if max_rank is not None:
+            query = query.filter(ranked.c.rank <= max_rank)
+        return query.order_by(ranked.c.rank, Leaderboard.id)
+
+    @staticmethod
+    def _serialize(rows, top=False):
+        """Response dicts for ranked rows: the /top shape if `top`, else the /global shape."""
+        user_ids = [entry.user_id for entry, _ in rows]
+        badge_counts = dict(
+            db.session.query(UserBadge.user_id, func.count(UserBadge.id))
+            .filter(UserBadge.user_id.in_(user_ids))
+            .group_by(UserBadge.user_id)
             .all()
+        ) if user_ids else {}
+        if top:
+            return [
+                {
+                    "rank": rank,
+                    "username": entry.user.username,
+                    "points": entry.total_points,
+                    "xp": entry.user.xp,
+                    "badges_count": badge_counts.get(entry.user_id, 0),
+                    "streak_days": entry.user.streak_days
+                } for entry, rank in rows
+            ]
+        return [
+            {
+                "rank": rank,
+                "user_id": entry.user_id,
+                "username": entry.user.username,
+                "points": entry.total_points,
+                "xp": entry.user.xp,
+                "badges_count": badge_counts.get(entry.user_id, 0)
+            } for entry, rank in rows
+        ]
+
+    @staticmethod
+    def get_top_users(limit=10):
+        return cached_with_stale(
+            f"leaderboard:top:{limit}", "short",
+            lambda: LeaderboardService._serialize(LeaderboardService.ranked_entries().limit(limit).all(), top=True),
+            version="leaderboard"
         )
 
     @staticmethod
     def get_user_rank(user_id):
-        entry = Leaderboard.query.filter_by(user_id=user_id).first()
-        return entry.rank if entry else None
+        points = (
+            select(Leaderboard.total_points)
+            .where(Leaderboard.user_id == user_id)
+            .scalar_subquery()
+        )
+        has_entry, ahead = db.session.query(
+            select(func.count(Leaderboard.id)).where(Leaderboard.user_id == user_id).scalar_subquery(),
+            select(func.count(Leaderboard.id)).where(Leaderboard.total_points > points).scalar_subquery()
+        ).one()
+        return ahead + 1 if has_entry else None
 
     @staticmethod
     def get_leaderboard_page(page=1, per_page=20):
-        return (
-            Leaderboard.query.join(User)
-            .order_by(Leaderboard.rank)
-            .paginate(page=page, per_page=per_page, error_out=False)
+        def produce():
+            pagination = LeaderboardService.ranked_entries().paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            return {
+                "items": LeaderboardService._serialize(pagination.items),
+                "pages": pagination.pages,
+                "total": pagination.total
+            }
+
+        return cached_with_stale(
+            f"leaderboard:page:{page}:{per_page}", "normal", produce, version="leaderboard"
         )
@@ -1,38 +1,83 @@
 # app/services/quiz_service.py
+from itertools import chain
+from sqlalchemy import and_, event, inspect, select
+from sqlalchemy.orm import Session
 from models import db, Quiz, Question, Choice, UserProgress, Module
 from services.core_services import PointsService
+from utils.cache import cache, QUIZ_SPEC_TIMEOUT
 from datetime import datetime
 
+
+def quiz_spec_key(quiz_id):
+    return f"quiz:{quiz_id}"
+
+
+def _ids_with_history(obj, attr):
+    """Current and pre-flush values of a foreign key, so a moved row touches both parents."""
+    history = inspect(obj).attrs[attr].history
+    return {getattr(obj, attr), *history.deleted}
+
+
+@event.listens_for(Session, "after_flush")
+def _track_quiz_changes(session, flush_context):
+    quiz_ids, question_ids = set(), set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Quiz):
+            quiz_ids.add(obj.id)
+        elif isinstance(obj, Question):
+            quiz_ids.update(_ids_with_history(obj, "quiz_id"))
+        elif isinstance(obj, Choice):
+            question_ids.update(_ids_with_history(obj, "question_id"))
+    question_ids.discard(None)
+    if question_ids:
+        quiz_ids.update(session.execute(
+            select(Question.quiz_id).where(Question.id.in_(question_ids))
+        ).scalars())
+    quiz_ids.discard(None)
+    if quiz_ids:
+        session.info.setdefault("changed_quizzes", set()).update(quiz_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_changed_quiz_specs(session):
+    # Every committed edit to a quiz, its questions or choices drops that quiz's spec
+    quiz_ids = session.info.pop("changed_quizzes", None)
+    if quiz_ids:
+        cache.delete_many(*(quiz_spec_key(quiz_id) for quiz_id in quiz_ids))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_quiz_changes(session):
+    session.info.pop("changed_quizzes", None)
+
+
 class QuizService:
     #Handles quiz grading, scoring, and user progress updates.
 
     @staticmethod
     def evaluate_quiz(user, quiz_id, user_answers):
 
-        quiz = Quiz.query.get(quiz_id)
+        quiz = QuizService._load_quiz_spec(quiz_id)
         if not quiz:
             raise ValueError("Quiz not found.")
 
-        total_questions = quiz.questions.count()
-        correct_answers = 0
-
-        for question in quiz.questions:
-            chosen_choice_id = user_answers.get(str(question.id)) or user_answers.get(question.id)
-            if not chosen_choice_id:
-                continue  # No answer provided
+        total_questions = quiz["total_questions"]
 
-            selected_choice = Choice.query.get(chosen_choice_id)
-            if selected_choice and selected_choice.is_correct:
-                correct_answers += 1
+        # A choice counts only if it is a correct choice of the question it was given for
+        answered_correctly = {
+            question_id
+            for question_id, choice_id in QuizService._answer_pairs(user_answers)
+            if choice_id in quiz["correct"].get(question_id, ())
+        }
+        correct_answers = len(answered_correctly)
 
         # Calculate score
         score_percent = int((correct_answers / total_questions) * 100)
-        passed = score_percent >= quiz.passing_score
+        passed = score_percent >= quiz["passing_score"]
 
-        module = quiz.module
-        progress = UserProgress.query.filter_by(user_id=user.id, module_id=module.id).first()
+        progress = UserProgress.query.filter_by(user_id=user.id, module_id=quiz["module_id"]).first()
         if not progress:
-            progress = UserProgress(user_id=user.id, module_id=module.id)
+            progress = UserProgress(user_id=user.id, module_id=quiz["module_id"])
 
         progress.last_score = score_percent
         progress.completion_percent = 100 if passed else 50  # Example rule
@@ -40,16 +85,71 @@ class QuizService:
             progress.completed_at = datetime.utcnow()
 
         db.session.add(progress)
-        db.session.commit()
 
         # Award points if passed
         if passed:
-            PointsService.award_points(user, "complete_quiz", metadata=f"Quiz {quiz.title}")
+            PointsService.award_points(user, "complete_quiz", metadata=f"Quiz {quiz['title']}")
 
         return {
-            "quiz_id": quiz.id,
+            "quiz_id": quiz_id,
             "score_percent": score_percent,
             "passed": passed,
             "total_questions": total_questions,
             "correct_answers": correct_answers
         }
+
+    @staticmethod
+    def _load_quiz_spec(quiz_id):
+        """Everything needed to grade a quiz, cached until the quiz changes.
+
+        Returns None if the quiz does not exist.
+        """
+        key = quiz_spec_key(quiz_id)
+        spec = cache.get(key)
+        if spec is not None:
+            return spec
+
+        # One row per correct choice (or per question without one), quiz columns repeated
+        rows = db.session.execute(
+            select(
+                Quiz.title, Quiz.module_id, Quiz.passing_score,
+                Question.id.label("question_id"), Choice.id.label("choice_id")
+            )
+            .select_from(Quiz)
+            .outerjoin(Question, Question.quiz_id == Quiz.id)
+            .outerjoin(Choice, and_(Choice.question_id == Question.id, Choice.is_correct.is_(True)))
+            .where(Quiz.id == quiz_id)
+        ).all()
+        if not rows:
+            return None
+
+        correct = {}
+        for row in rows:
+            if row.question_id is None:
+                continue
+            choices = correct.setdefault(row.question_id, set())
+            if row.choice_id is not None:
+                choices.add(row.choice_id)
+
+        spec = {
+            "title": rows[0].title,
+            "module_id": rows[0].module_id,
+            "passing_score": rows[0].passing_score,
+            "total_questions": len(correct),
+            "correct": correct,
+        }
+        cache.set(key, spec, timeout=QUIZ_SPEC_TIMEOUT)
+        return spec
+
+    @staticmethod
+    def _answer_pairs(user_answers):
+        """(question_id, choice_id) pairs from the submitted answers, skipping blanks and junk."""
+        pairs = []
+        for question_id, choice_id in (user_answers or {}).items():
+            if not choice_id:
+                continue  # No answer provided
+            try:
+                pairs.append((int(question_id), int(choice_id)))
+            except (TypeError, ValueError):
+                continue
+        return pairs
@@ -0,0 +1,49 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from models import db, User
+from services.core_services import PointsService
+from utils.cache import invalidate_profile
+
+logger = logging.getLogger(__name__)
+
+# Work that does not need to finish before the HTTP response is sent
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="background-task")
+
+
+def enqueue(task, *args, on_commit=None, **kwargs):
+    """Run `task` on the background pool inside its own app context and session.
+
+    The task itself never commits: its work is committed here in one go, or
+    rolled back if it raises. `on_commit` runs only after that commit.
+    """
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            try:
+                task(*args, **kwargs)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                logger.exception("Background task %s failed", task.__name__)
+                return
+            if on_commit:
+                on_commit()
+
+    return _executor.submit(run)
+
+
+def award_points_task(user_id, action, metadata=None):
+    user = db.session.get(User, user_id)
+    if not user:
+        return None
+    return PointsService.award_points(user, action, metadata)
+
+
+def enqueue_award_points(user_id, action, metadata=None):
+    """Award points (and any badges they unlock) after the request has returned."""
+    return enqueue(
+        award_points_task, user_id, action, metadata,
+        on_commit=lambda: invalidate_profile(user_id)
+    )
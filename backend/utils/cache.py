@@ -0,0 +1,144 @@
+import logging
+import time
+from itertools import chain
+from cachelib.redis import RedisCache
+from flask_caching import Cache
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models import db
+
+logger = logging.getLogger(__name__)
+
+# Redis-backed when REDIS_URL is set, in-process otherwise (see app.py)
+cache = Cache()
+
+PROFILE_TIMEOUT = 30
+# Longest access token lifetime issued at login (see routes/auth.py)
+TOKEN_MAX_AGE = 8 * 60 * 60
+QUIZ_SPEC_TIMEOUT = 20 * 60
+
+# Freshness tiers (seconds) for endpoint caches
+CACHE_POLICIES = {
+    "short": 15,
+    "normal": 30,
+    "long": 300,
+}
+# Stale copies are kept this many times longer than they stay fresh
+STALE_FACTOR = 10
+
+
+def profile_cache_key(user_id):
+    return f"profile:{user_id}"
+
+
+def me_cache_key(user_id):
+    return f"me:{user_id}"
+
+
+def invalidate_profile(user_id):
+    """Drop every cached view of this user's own account (/user/profile and /auth/me)."""
+    cache.delete_many(profile_cache_key(user_id), me_cache_key(user_id))
+
+
+def revoked_tokens_key(user_id):
+    return f"revoked:{user_id}"
+
+
+def revoke_user_tokens(user_id):
+    """Reject every token issued to this user up to now (account deleted or role changed)."""
+    cache.set(revoked_tokens_key(user_id), int(time.time()), timeout=TOKEN_MAX_AGE)
+
+
+def is_token_revoked(jwt_header, jwt_payload):
+    """JWTManager blocklist check: a cache lookup, no database query."""
+    revoked_at = cache.get(revoked_tokens_key(jwt_payload["sub"]))
+    return revoked_at is not None and jwt_payload["iat"] <= revoked_at
+
+
+def bump_version(name):
+    """Mark every entry cached under version `name` as stale."""
+    key = f"version:{name}"
+    version = current_version(name)
+    if isinstance(cache.cache, RedisCache):
+        # Atomic INCR; it never puts a TTL on the key
+        cache.cache.inc(key)
+    else:
+        cache.set(key, version + 1, timeout=0)
+
+
+def current_version(name):
+    """Current value of version counter `name`.
+
+    Counters are stored without expiry. If one is lost anyway (evicted or
+    flushed), it restarts from the clock rather than from 0, so it never
+    repeats a number that older cache entries may still carry.
+    """
+    key = f"version:{name}"
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=0)
+        version = cache.get(key)
+    return version
+
+
+def bump_version_on_commit(name):
+    """Bump version `name` once the current transaction commits; a rollback drops it.
+
+    Needs the listeners from ``bump_version_on_change(name)`` to be registered.
+    """
+    db.session.info[f"changed:{name}"] = True
+
+
+def bump_version_on_change(name, *models):
+    """Bump version `name` after any commit that inserted, updated or deleted one of `models`.
+
+    With no models, the version only moves for ``bump_version_on_commit(name)``.
+    """
+    flag = f"changed:{name}"
+
+    @event.listens_for(Session, "after_flush")
+    def track(session, flush_context):
+        if any(isinstance(obj, models) for obj in chain(session.new, session.dirty, session.deleted)):
+            session.info[flag] = True
+
+    @event.listens_for(Session, "after_commit")
+    def bump(session):
+        if session.info.pop(flag, False):
+            bump_version(name)
+
+    @event.listens_for(Session, "after_rollback")
+    def discard(session):
+        session.info.pop(flag, None)
+
+
+def cached_with_stale(key, policy, produce, version=None):
+    """Return the cached value for `key` while fresh, else call `produce()`.
+
+    If `produce()` fails and a stale copy is still around, that copy is served
+    instead of the error. Bumping `version` makes existing entries stale
+    without deleting them, so they remain available as a fallback.
+    """
+    version_key = f"version:{version}" if version else None
+    entry, live_version = cache.get_many(key, version_key) if version_key else (cache.get(key), None)
+    now = time.time()
+
+    if entry and now < entry["fresh_until"] and entry["version"] == live_version:
+        return entry["data"]
+
+    try:
+        data = produce()
+    except Exception:
+        if not entry:
+            raise
+        db.session.rollback()
+        logger.warning("Serving stale cache entry %s generated at %s", key, entry["generated_at"], exc_info=True)
+        return entry["data"]
+
+    timeout = CACHE_POLICIES[policy]
+    cache.set(key, {
+        "data": data,
+        "version": live_version,
+        "generated_at": now,
+        "fresh_until": now + timeout,
+    }, timeout=timeout * STALE_FACTOR)
+    return data
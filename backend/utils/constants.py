@@ -1,4 +1,7 @@
-POINTS_CONFIG = {
+from types import MappingProxyType
+
+# Read-only at runtime: award logic must not be able to change the rules
+POINTS_CONFIG = MappingProxyType({
     'complete_module': 50,
     'complete_quiz': 30,
     'pass_quiz': 50,
@@ -6,6 +9,7 @@ POINTS_CONFIG = {
     
     'create_resource': 25,
     'create_learning_path': 100,
+    'learning_path_approved': 150,
     'rate_resource': 5,
     'create_post': 15,
     'create_comment': 10,
@@ -13,56 +17,58 @@ POINTS_CONFIG = {
     'receive_rating_5_star': 20,
     'resource_used_100_times': 100,
     'daily_login': 5,
+    'earn_badge': 20,
     
     'complete_challenge': 200,
     'participate_event': 50,
     'win_leaderboard_weekly': 300,
-}
+})
 
-XP_CONFIG = {
+XP_CONFIG = MappingProxyType({
     'complete_module': 100,
     'pass_quiz': 150,
     'create_resource': 50,
     'create_learning_path': 200,
+    'learning_path_approved': 300,
     'complete_challenge': 500,
     'daily_streak_7_days': 200,
     'daily_streak_30_days': 500,
-}
-BADGE_RULES = {
-    "first_module": {
+})
+BADGE_RULES = MappingProxyType({
+    "first_module": MappingProxyType({
         "name": "First Module Completed",
         "description": "Awarded for completing your first module."
-    },
-    "first_quiz": {
+    }),
+    "first_quiz": MappingProxyType({
         "name": "First Quiz Completed",
         "description": "Awarded for completing your first quiz."
-    },
-    "first_learning_path": {
+    }),
+    "first_learning_path": MappingProxyType({
         "name": "First Learning Path Created",
         "description": "Awarded for creating your first learning path."
-    },
-    "first_login": {
+    }),
+    "first_login": MappingProxyType({
         "name": "Welcome Aboard!",
         "description": "Awarded on your first login."
-    },
-    "quiz_master": {
+    }),
+    "quiz_master": MappingProxyType({
         "name": "Quiz Master",
         "description": "Awarded for completing 10 quizzes with perfect scores."
-    },
-    "module_explorer": {
+    }),
+    "module_explorer": MappingProxyType({
         "name": "Module Explorer",
         "description": "Awarded for completing 5 different modules."
-    },
-    "streak_30_days": {
+    }),
+    "streak_30_days": MappingProxyType({
         "name": "Monthly Master",
         "description": "Awarded for maintaining a 30-day learning streak."
-    },
-    "path_completer": {
+    }),
+    "path_completer": MappingProxyType({
         "name": "Pathfinder",
         "description": "Awarded for completing your first learning path."
-    },
-    "subject_master": {
+    }),
+    "subject_master": MappingProxyType({
         "name": "Subject Master",
         "description": "Awarded for completing all modules in a subject category."
-    }
-}
\ No newline at end of file
+    })
+})
\ No newline at end of file
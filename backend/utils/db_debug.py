@@ -0,0 +1,68 @@
+import logging
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, raiseload
+
+logger = logging.getLogger(__name__)
+
+
+def _raise_on_lazy_load(orm_execute_state):
+    # Only top-level entity queries; loads issued by selectinload/refresh keep their own options
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            raiseload("*", sql_only=True)
+        )
+
+
+def enable_raiseload():
+    """Make any lazy relationship load that would hit the database raise instead.
+
+    Meant for development and tests: an accidental N+1 fails loudly rather than
+    silently issuing one SELECT per row. Relationships that are eager-loaded, or
+    already in the identity map, keep working.
+    """
+    if not event.contains(Session, "do_orm_execute", _raise_on_lazy_load):
+        event.listen(Session, "do_orm_execute", _raise_on_lazy_load)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        # A mutable holder so a streamed body, which runs after after_request,
+        # still adds to the count that is logged when the response closes
+        g.setdefault("query_count", {"count": 0})["count"] += 1
+
+
+def _report_query_count(response):
+    counter = g.setdefault("query_count", {"count": 0})
+    method, path = request.method, request.path
+
+    if response.is_streamed:
+        # The body has not run yet, so any count now would be too low
+        response.headers["X-DB-Queries"] = "streamed"
+        response.call_on_close(lambda: logger.debug(
+            "%s %s issued %d SQL statement(s) (streamed)", method, path, counter["count"]
+        ))
+        return response
+
+    response.headers["X-DB-Queries"] = str(counter["count"])
+    logger.debug("%s %s issued %d SQL statement(s)", method, path, counter["count"])
+    return response
+
+
+def enable_query_counter(app):
+    """Count the SQL statements each request issues.
+
+    The total goes out in an ``X-DB-Queries`` response header and the debug
+    log, so a new N+1 shows up as a jump in the number rather than only as
+    slower responses. Streamed responses (``GET /user/all``) generate their
+    body after the headers are sent, so their header reads ``streamed`` and
+    only the debug log, written when the response closes, has the real count.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _count_query):
+        event.listen(Engine, "before_cursor_execute", _count_query)
+    app.after_request(_report_query_count)
@@ -0,0 +1,37 @@
+import hashlib
+from functools import wraps
+from flask import Response, make_response, request
+
+
+def make_etag(*parts):
+    """Build a weak ETag value from the values a response depends on."""
+    return hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()
+
+
+def not_modified(etag):
+    """Return a 304 response if the client already holds `etag`, else None."""
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+
+def etag_from_body(view):
+    """Tag a view's 200 responses with an ETag of their body and answer 304 on a match.
+
+    Put it above ``cache.cached`` so a repeat request for an unchanged,
+    cached response costs neither a query nor the response bytes.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response = make_response(view(*args, **kwargs))
+        if response.status_code != 200:
+            return response
+        etag = hashlib.sha1(response.get_data()).hexdigest()
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        response.set_etag(etag, weak=True)
+        return response
+    return wrapper
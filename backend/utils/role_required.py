@@ -1,7 +1,8 @@
 from functools import wraps
-from flask_jwt_extended import get_jwt_identity
+from flask_jwt_extended import get_jwt, get_jwt_identity
 from flask import jsonify
-from models import User
+from sqlalchemy import select
+from models import db, User
 
 def role_required(*roles):
     def wrapper(fn):
@@ -12,12 +13,16 @@ def role_required(*roles):
             if not user_id:
                 return jsonify({"error": "Unauthorized"}), 401
 
-            # Convert to int just to be safe
-            user = User.query.get(int(user_id))
-            if not user:
-                return jsonify({"error": "User not found"}), 404
+            # Role is stamped into the token at login; no query needed
+            role = get_jwt().get("role")
+            if role is None:
+                # Tokens issued before the claim existed: look the role up once
+                user_role = db.session.scalar(select(User.role).where(User.id == int(user_id)))
+                if user_role is None:
+                    return jsonify({"error": "User not found"}), 404
+                role = user_role.value
 
-            if user.role.value not in roles:
+            if role not in roles:
                 return jsonify({"error": "Forbidden"}), 403
 
             return fn(*args, **kwargs)
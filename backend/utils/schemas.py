@@ -0,0 +1,106 @@
+from typing import Annotated, ClassVar, List, Literal, Optional
+from flask import jsonify, request
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, ValidationError, model_validator
+
+RequiredStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+ReviewAction = Literal["approve", "reject"]
+
+
+class Schema(BaseModel):
+    """Base for request bodies. Strips strings and ignores unknown keys."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    # Per-field error message returned instead of pydantic's default text
+    error_messages: ClassVar[dict] = {}
+    # Per-field message for a missing, null or blank value; takes precedence over error_messages
+    required_messages: ClassVar[dict] = {}
+
+
+class CreatePathIn(Schema):
+    title: Annotated[str, StringConstraints(strip_whitespace=True, min_length=5)]
+    description: str = ""
+
+    error_messages: ClassVar[dict] = {"title": "Title must be at least 5 characters"}
+    required_messages: ClassVar[dict] = {"title": "Title is required"}
+
+
+class ReviewPathIn(Schema):
+    action: ReviewAction
+    reason: str = ""
+
+    error_messages: ClassVar[dict] = {"action": "Invalid action"}
+
+
+class FollowPathsIn(Schema):
+    path_ids: List[int] = Field(min_length=1, max_length=100)
+
+    error_messages: ClassVar[dict] = {"path_ids": "Provide between 1 and 100 path IDs"}
+
+
+class CreateResourceIn(Schema):
+    title: RequiredStr
+    url: RequiredStr
+    type: RequiredStr = "article"
+    description: str = ""
+
+    error_messages: ClassVar[dict] = {
+        "title": "Both title and URL are required",
+        "url": "Both title and URL are required",
+    }
+
+
+class FlagContentIn(Schema):
+    post_id: Optional[int] = None
+    comment_id: Optional[int] = None
+    reason: RequiredStr
+
+    error_messages: ClassVar[dict] = {"reason": "Reason is required for flagging content"}
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if not self.post_id and not self.comment_id:
+            raise ValueError("Either post_id or comment_id is required")
+        return self
+
+
+class ResolveFlagIn(Schema):
+    action: ReviewAction
+    admin_notes: str = ""
+
+    error_messages: ClassVar[dict] = {"action": "Action must be 'approve' or 'reject'"}
+
+
+class BulkFlagActionIn(Schema):
+    flag_ids: List[int] = Field(min_length=1)
+    action: ReviewAction
+    admin_notes: str = ""
+
+    error_messages: ClassVar[dict] = {
+        "flag_ids": "No flag IDs provided",
+        "action": "Action must be 'approve' or 'reject'",
+    }
+
+
+def _error_message(schema, exc):
+    error = exc.errors()[0]
+    field = error["loc"][0] if error["loc"] else None
+    value = error.get("input")
+    is_blank = error["type"] == "missing" or value is None or (isinstance(value, str) and not value.strip())
+    if is_blank and field in schema.required_messages:
+        return schema.required_messages[field]
+    if field in schema.error_messages:
+        return schema.error_messages[field]
+    if error["type"] == "value_error":
+        return str(error["ctx"]["error"])
+    return f"{field}: {error['msg']}" if field else error["msg"]
+
+
+def parse_body(schema):
+    """Validate the raw JSON body against `schema`.
+
+    Returns (data, None) on success or (None, error_response) on failure.
+    """
+    try:
+        return schema.model_validate_json(request.get_data() or b"{}"), None
+    except ValidationError as e:
+        return None, (jsonify({"error": _error_message(schema, e)}), 400)